@@ -0,0 +1,325 @@
+import pandas as pd
+import argparse
+import bz2
+import gzip
+import hashlib
+import multiprocessing
+import os
+import random
+import resource
+import shutil
+import tempfile
+import time
+import extract_wiki
+
+
+
+# Synthetic dbnary dump: pages describing entries, entries with their senses and canonical form,
+# senses with a (labelled) definition and example blank nodes, forms with a gender,
+# and paragraphs of other rdf types (translations, glosses) that the extraction skips.
+
+PREFIXES = {"fra": "http://kaiko.getalp.org/dbnary/fra/",
+            "dbnary": "http://kaiko.getalp.org/dbnary#",
+            "ontolex": "http://www.w3.org/ns/lemon/ontolex#",
+            "lexinfo": "http://www.lexinfo.net/ontology/2.0/lexinfo#",
+            "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+            "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+            "skos": "http://www.w3.org/2004/02/skos/core#",
+            "dct": "http://purl.org/dc/terms/",
+            "lexvo": "http://lexvo.org/id/iso639-3/",
+            "xsd": "http://www.w3.org/2001/XMLSchema#"}
+
+# (dbnary part of speech, lexinfo part of speech, section name used in the entry id)
+PARTS_OF_SPEECH = [('"-nom-"', "lexinfo:noun", "nom"),
+                   ('"-nom-pr-"', "lexinfo:properNoun", "nom_propre"),
+                   ('"-verb-"', "lexinfo:verb", "verb"),
+                   ('"-adj-"', "lexinfo:adjective", "adj"),
+                   ('"-adv-"', "lexinfo:adverb", "adv")]
+
+GENDERS = ["lexinfo:masculine", "lexinfo:feminine", None]
+
+LABELS = ["Zoologie", "Botanique", "Cuisine", "Droit", "Informatique", "Figuré", "Familier", "Vieilli", "Archaïque", "Désuet"]
+
+SYLLABLES = ["ba", "cha", "de", "fi", "ga", "jou", "la", "mé", "no", "pa", "ra", "si", "té", "vo", "zè", "ton", "lin", "mar", "bou", "çon"]
+
+WORDS = ["le", "la", "les", "un", "une", "de", "du", "et", "est", "dans", "sur", "avec", "pour", "qui", "que", "il", "elle", "on",
+         "grand", "petit", "vieux", "nouveau", "toujours", "jamais", "maison", "jardin", "ville", "temps", "main", "yeux", "eau"]
+
+TARGET_LANGUAGES = ["eng", "deu", "ita", "spa", "por", "nld", "pol", "rus"]
+
+MAX_ENTRIES_PER_PAGE = 3
+MAX_SENSES_PER_ENTRY = 6
+MAX_EXAMPLES_PER_SENSE = 5
+MAX_TRANSLATIONS_PER_ENTRY = 8
+
+
+def random_word(rng):
+	return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4)))
+
+def random_sentence(rng, lemma, nb_words):
+	words = [rng.choice(WORDS) for _ in range(nb_words)]
+	words.insert(rng.randrange(len(words) + 1), lemma)
+	sentence = ' '.join(words)
+	# some examples have quotes, elisions and non ascii punctuation, as in the real dumps
+	if rng.random() < 0.2: sentence = sentence.replace(' le ', " l’", 1)
+	if rng.random() < 0.1: sentence = sentence.replace(lemma, '\\"' + lemma + '\\"', 1)
+	return sentence[0].upper() + sentence[1:] + rng.choice(['.', ' !', ' ?', '…'])
+
+def turtle_string(text):
+	return '"' + text + '"@fr'
+
+
+def page_paragraph(page, entry_ids):
+	lines = [f"fra:{page}  rdf:type        dbnary:Page ;"]
+	lines.append("        dbnary:describes  " + " , ".join(f"fra:{entry_id}" for entry_id in entry_ids) + " .")
+	return lines
+
+def entry_paragraph(entry_id, lemma, pos, sense_ids, form_id, rng):
+	dbnary_pos, lexinfo_pos, _ = pos
+	rdf_types = "ontolex:LexicalEntry , ontolex:MultiWordExpression" if '_' in lemma else "ontolex:LexicalEntry , ontolex:Word"
+	lines = [f"fra:{entry_id}  rdf:type    {rdf_types} ;",
+	         f"        dbnary:partOfSpeech     {dbnary_pos} ;",
+	         f"        dct:language            lexvo:fra ;",
+	         f"        lexinfo:partOfSpeech    {lexinfo_pos} ;",
+	         f"        ontolex:canonicalForm   fra:{form_id} ;"]
+	if rng.random() < 0.3:
+		lines.append(f"        dbnary:synonym          fra:{random_word(rng)} ;")
+	lines.append("        ontolex:sense           " + " , ".join(f"fra:{sense_id}" for sense_id in sense_ids) + " ;")
+	lines.append(f"        rdfs:label              {turtle_string(lemma.replace('_', ' '))} .")
+	return lines
+
+def sense_paragraph(sense_id, number, lemma, rng):
+	definition = random_sentence(rng, lemma, rng.randint(4, 15))
+	labels = rng.sample(LABELS, rng.choice([0, 0, 0, 1, 1, 2]))
+	definition = ''.join(f"({label}) " for label in labels) + definition
+	lines = [f"fra:{sense_id}",
+	         "        rdf:type            ontolex:LexicalSense ;",
+	         f'        dbnary:senseNumber  "{number}"^^xsd:int ;',
+	         f"        skos:definition     [ rdf:value  {turtle_string(definition)} ] ;"]
+	nb_examples = rng.randint(0, MAX_EXAMPLES_PER_SENSE)
+	examples = []
+	for _ in range(nb_examples):
+		example = f"[ rdf:value  {turtle_string(random_sentence(rng, lemma, rng.randint(5, 25)))}"
+		if rng.random() < 0.5: example += f' ;\n                              dbnary:exampleSource  "{random_word(rng).capitalize()}, {rng.randint(1800, 2020)}"'
+		examples.append(example + " ]")
+	if examples:
+		# examples are written either as an object list or as repeated predicates
+		if rng.random() < 0.5:
+			lines.append("        skos:example        " + " ,\n                            ".join(examples) + " ;")
+		else:
+			lines.extend(f"        skos:example        {example} ;" for example in examples)
+	lines[-1] = lines[-1][:-2] + " ."
+	return '\n'.join(lines).split('\n')
+
+def form_paragraph(form_id, lemma, rng):
+	lines = [f"fra:{form_id}",
+	         "        rdf:type            ontolex:Form ;"]
+	gender = rng.choice(GENDERS)
+	if gender: lines.append(f"        lexinfo:gender      {gender} ;")
+	lines.append(f"        ontolex:phoneticRep  \"{random_word(rng)}\"@fr-fonipa ;")
+	lines.append(f"        ontolex:writtenRep  {turtle_string(lemma.replace('_', ' '))} .")
+	return lines
+
+def translation_paragraph(translation_id, entry_id, rng):
+	return [f"fra:{translation_id}",
+	        "        rdf:type                dbnary:Translation ;",
+	        f"        dbnary:isTranslationOf  fra:{entry_id} ;",
+	        f"        dbnary:targetLanguage   lexvo:{rng.choice(TARGET_LANGUAGES)} ;",
+	        f"        dbnary:writtenForm      \"{random_word(rng)}\"@{rng.choice(['en', 'de', 'it', 'es'])} ."]
+
+def gloss_paragraph(gloss_id, lemma, rng):
+	return [f"fra:{gloss_id}",
+	        "        rdf:type         dbnary:Gloss ;",
+	        f"        rdf:value        {turtle_string(random_sentence(rng, lemma, rng.randint(2, 6)))} ;",
+	        f"        dbnary:rank      {rng.randint(1, 10)} ."]
+
+
+def open_output(output_file):
+	if output_file.endswith('.bz2'): return bz2.open(output_file, 'wt', encoding='utf-8')
+	if output_file.endswith('.gz'): return gzip.open(output_file, 'wt', encoding='utf-8')
+	return open(output_file, 'w', encoding='utf-8')
+
+def generate_dump(output_file, nb_pages, seed=0, other_paragraphs=1.0):
+	"""Write a synthetic dbnary ttl dump of nb_pages pages, plain or compressed after the file extension.
+	other_paragraphs scales the number of translation and gloss paragraphs per entry.
+	Returns the number of lines and paragraphs written."""
+	rng = random.Random(seed)
+	nb_lines = 0
+	nb_paragraphs = 0
+
+	with open_output(output_file) as file:
+		for prefix, iri in PREFIXES.items():
+			file.write(f"@prefix {prefix}: <{iri}> .\n")
+		file.write("\n")
+		nb_lines += len(PREFIXES) + 1
+
+		used_lemmas = set()
+		for _ in range(nb_pages):
+			lemma = random_word(rng)
+			if rng.random() < 0.05: lemma += "_de_" + random_word(rng)
+			if rng.random() < 0.1: lemma = lemma.capitalize()
+			while lemma in used_lemmas: lemma += rng.choice(SYLLABLES)
+			used_lemmas.add(lemma)
+
+			paragraphs = []
+			entry_ids = []
+			for pos in rng.sample(PARTS_OF_SPEECH, rng.randint(1, MAX_ENTRIES_PER_PAGE)):
+				entry_id = f"{lemma}__{pos[2]}__1"
+				entry_ids.append(entry_id)
+				form_id = f"__cf_{entry_id}"
+				sense_ids = [f"__ws_{n}_{entry_id}" for n in range(1, rng.randint(1, MAX_SENSES_PER_ENTRY) + 1)]
+
+				paragraphs.append(entry_paragraph(entry_id, lemma, pos, sense_ids, form_id, rng))
+				for n, sense_id in enumerate(sense_ids, 1):
+					paragraphs.append(sense_paragraph(sense_id, n, lemma, rng))
+				paragraphs.append(form_paragraph(form_id, lemma, rng))
+
+				nb_translations = round(rng.randint(0, MAX_TRANSLATIONS_PER_ENTRY) * other_paragraphs)
+				for n in range(1, nb_translations + 1):
+					paragraphs.append(translation_paragraph(f"__tr_{n}_{entry_id}", entry_id, rng))
+				if nb_translations and rng.random() < 0.5:
+					paragraphs.append(gloss_paragraph(f"__gloss_1_{entry_id}", lemma, rng))
+
+			# the page paragraph comes first, the other paragraphs of the page follow in a shuffled order
+			first = page_paragraph(lemma, entry_ids)
+			rng.shuffle(paragraphs)
+			for paragraph in [first] + paragraphs:
+				file.write('\n'.join(paragraph) + "\n\n")
+				nb_lines += len(paragraph) + 1
+				nb_paragraphs += 1
+
+	return nb_lines, nb_paragraphs
+
+
+
+# Benchmark of extract_wiki_data + data2df. Each mode runs in a fresh process so that its peak RSS is its own.
+
+def peak_rss_mb():
+	# ru_maxrss is in kilobytes on Linux; worker processes of the parallel mode are counted in the children usage
+	own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+	return own / 1024, children / 1024
+
+def output_sha1(df):
+	# labels are joined from a set, whose order depends on the hash seed of each process:
+	# outputs are compared on the ordered content hashes of their senses, which sort the labels
+	sha1 = hashlib.sha1()
+	for sense_id, sense_hash in extract_wiki.sense_hashes(df).items():
+		sha1.update(f"{sense_id}\t{sense_hash}\n".encode('utf-8'))
+	return sha1.hexdigest()
+
+def run_mode(input_file, output_file, options, results):
+	start = time.perf_counter()
+	wiki_data = extract_wiki.extract_wiki_data(input_file, **options)
+	extract_time = time.perf_counter() - start
+	df = extract_wiki.data2df(wiki_data, output_file)
+	total_time = time.perf_counter() - start
+	rss, children_rss = peak_rss_mb()
+	results.put({'extract_time': extract_time, 'total_time': total_time, 'rows': len(df),
+	             'rss': rss, 'children_rss': children_rss, 'sha1': output_sha1(df)})
+
+def benchmark_mode(input_file, output_file, options):
+	context = multiprocessing.get_context('spawn')
+	results = context.Queue()
+	process = context.Process(target=run_mode, args=(input_file, output_file, options, results))
+	process.start()
+	result = results.get()
+	process.join()
+	return result
+
+
+def count_lines_paragraphs(input_file):
+	# every paragraph of the dump is counted, whether the extraction keeps it or not
+	nb_lines = 0
+	nb_paragraphs = 0
+	in_paragraph = False
+	for line in extract_wiki.read_lines(input_file):
+		nb_lines += 1
+		if line.strip():
+			if not in_paragraph and not line.startswith('@prefix'): nb_paragraphs += 1
+			in_paragraph = True
+		else:
+			in_paragraph = False
+	return nb_lines, nb_paragraphs
+
+
+def parse_mode(mode, workers):
+	# sequential, parallel, selective, store and intern can be combined with '+', e.g. parallel+selective
+	options = {}
+	for name in mode.split('+'):
+		if name == 'sequential': pass
+		elif name == 'parallel': options['workers'] = workers
+		elif name == 'selective': options['selective'] = True
+		elif name == 'store': options['store'] = True
+		elif name == 'intern': options['intern'] = True
+		else: raise ValueError(f"Unknown benchmark mode: {name}")
+	return options
+
+def benchmark(input_file, modes, workers, repeat=1, reference=None):
+	nb_lines, nb_paragraphs = count_lines_paragraphs(input_file)
+	print(f"Benchmark on {input_file}: {nb_lines} lines, {nb_paragraphs} paragraphs, {os.path.getsize(input_file) / 2**20:.1f} MB.")
+
+	reference_sha1 = output_sha1(pd.read_csv(reference, sep='\t', dtype=str, keep_default_na=False)) if reference and os.path.exists(reference) else None
+	work_dir = tempfile.mkdtemp(prefix='bench_extract_wiki_')
+	rows = []
+	try:
+		for mode in modes:
+			options = parse_mode(mode, workers)
+			for run in range(repeat):
+				output_file = os.path.join(work_dir, f"{mode}_{run}.tsv")
+				if options.get('store'): options['store'] = os.path.join(work_dir, f"{mode}_{run}.sqlite")
+				result = benchmark_mode(input_file, output_file, options)
+				result['mode'] = mode
+				if reference_sha1 is None:
+					# the first run is the reference of the others, and is saved if a reference file was given
+					reference_sha1 = result['sha1']
+					if reference: shutil.copyfile(output_file, reference)
+				result['same_output'] = result['sha1'] == reference_sha1
+				rows.append(result)
+				os.remove(output_file)
+	finally:
+		shutil.rmtree(work_dir)
+
+	print(f"{'mode':<28}{'extract s':>10}{'total s':>10}{'lines/s':>12}{'paragraphs/s':>14}{'rss MB':>9}{'workers MB':>12}{'rows':>9}  same output")
+	for result in rows:
+		print(f"{result['mode']:<28}{result['extract_time']:>10.2f}{result['total_time']:>10.2f}"
+		      f"{nb_lines / result['total_time']:>12.0f}{nb_paragraphs / result['total_time']:>14.0f}"
+		      f"{result['rss']:>9.0f}{result['children_rss']:>12.0f}{result['rows']:>9}  {'yes' if result['same_output'] else 'NO'}")
+	return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic dbnary TTL dump and benchmark the extraction of extract_wiki.py on it.")
+    parser.add_argument('--input', help='Path to an existing TTL dump file to benchmark (plain or compressed). If not given, a synthetic dump is generated.')
+    parser.add_argument('--generate', help='Path to the synthetic TTL dump file to write, compressed if it ends with .bz2 or .gz (default: a temporary file).')
+    parser.add_argument('--pages', type=int, default=20000, help='Number of pages of the synthetic dump (default: 20000).')
+    parser.add_argument('--other_paragraphs', type=float, default=1.0, help='Scale of the number of translation and gloss paragraphs that the extraction skips (default: 1.0).')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the synthetic dump (default: 0).')
+    parser.add_argument('--modes', nargs='+', default=['sequential', 'parallel', 'selective', 'store'], help="Extraction modes to benchmark, among sequential, parallel, selective, store and intern, combined with '+' (default: sequential parallel selective store).")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of worker processes of the parallel mode (default: number of cpus).')
+    parser.add_argument('--repeat', type=int, default=1, help='Number of runs of each mode (default: 1).')
+    parser.add_argument('--reference', help='Path to a reference output TSV file: outputs are compared to it, it is written from the first run if it does not exist.')
+    parser.add_argument('--generate_only', action='store_true', help='Only write the synthetic dump, without running the benchmark.')
+    args = parser.parse_args()
+
+    input_file = args.input
+    temporary_file = None
+    if input_file is None:
+        input_file = args.generate
+        if input_file is None:
+            temporary_file = tempfile.NamedTemporaryFile(suffix='.ttl', delete=False)
+            temporary_file.close()
+            input_file = temporary_file.name
+        start = time.perf_counter()
+        nb_lines, nb_paragraphs = generate_dump(input_file, args.pages, seed=args.seed, other_paragraphs=args.other_paragraphs)
+        print(f"Generated {input_file}: {args.pages} pages, {nb_lines} lines, {nb_paragraphs} paragraphs in {time.perf_counter() - start:.1f}s.")
+
+    try:
+        if not args.generate_only:
+            benchmark(input_file, args.modes, args.workers, repeat=args.repeat, reference=args.reference)
+    finally:
+        if temporary_file is not None:
+            os.remove(input_file)
+
+if __name__ == "__main__":
+    main()
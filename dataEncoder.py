@@ -1,5 +1,5 @@
 import pandas as pd
-from collections import Counter, defaultdict
+from collections import Counter, defaultdict, OrderedDict
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
@@ -8,9 +8,16 @@ import sacremoses
 from random import shuffle
 import numpy as np
 from transformers import AutoModel, AutoTokenizer
+from transformers import __version__ as transformers_version
 from matplotlib import pyplot as plt
 import warnings
 import copy
+import json
+import os
+import hashlib
+import shutil
+import dataIO
+from itertools import accumulate
 warnings.filterwarnings("ignore")
 
 
@@ -33,19 +40,138 @@ NB_CLASSES = len(supersense2i)
 MODEL_NAME = "flaubert/flaubert_large_cased"
 PADDING_TOKEN_ID = 2
 MAX_LENGTH = 100
+# number of senses whose examples are encoded at once by encoded_senses
+ENCODING_CHUNK_SIZE = 1000
+# number of words kept in a word cache
+WORD_CACHE_SIZE = 1000000
+# version of the encoding of the datasets, part of the keys of the encoded datasets saved by Encoder.encode: to be changed when the encoding changes
+ENCODING_CACHE_VERSION = 1
+# number of batches of a bucket of shuffled items sorted by length, with dynamic padding
+BUCKET_SIZE = 100
 
 
-def flatten_list(lst):
-    return [item for sublist in lst for item in (sublist if isinstance(sublist, list) else [sublist])]
+def tokenizer_name(tokenizer):
+	return f"{tokenizer.name_or_path}-{type(tokenizer).__name__}-{len(tokenizer)}-transformers{transformers_version}"
 
-def token_rank(lst, index):
-	count = 0
-	for i in range(index):
-		count += len(lst[i])
-	return count
+
+class wordCache:
+	# subword ids of the words encoded with a tokenizer, without the least recently used words beyond max_size.
+	# With a path, the cache is read from a json file if it was saved there with the same tokenizer (name, class, vocabulary size
+	# and transformers version), and save writes it there. hits and misses count the lookups of distinct words of each encoding call.
+	
+	def __init__(self, tokenizer, path=None, max_size=WORD_CACHE_SIZE):
+		self.tokenizer_name = tokenizer_name(tokenizer)
+		self.path = path
+		self.max_size = max_size
+		self.words = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+		
+		if path is not None and os.path.exists(path):
+			with open(path, encoding='utf-8') as f:
+				saved = json.load(f)
+			if saved['tokenizer'] == self.tokenizer_name: self.words = OrderedDict(saved['words'][-max_size:])
+	
+	def get(self, word):
+		ids = self.words.get(word)
+		if ids is None: 
+			self.misses += 1
+		else:
+			self.hits += 1
+			self.words.move_to_end(word)
+		return ids
+	
+	def put(self, word, ids):
+		self.words[word] = ids
+		self.words.move_to_end(word)
+		if len(self.words) > self.max_size: self.words.popitem(last=False)
+	
+	def hit_rate(self):
+		return self.hits / max(self.hits + self.misses, 1)
+	
+	def save(self):
+		# words from the least to the most recently used
+		with open(self.path, 'w', encoding='utf-8') as f:
+			json.dump({'tokenizer': self.tokenizer_name, 'words': list(self.words.items())}, f, ensure_ascii=False)
+
+
+# word caches shared by the encoders, by tokenizer
+word_caches = {}
+
+def shared_word_cache(tokenizer, path=None):
+	# the word cache of the tokenizer, created at the first call, from the file at path if there is one
+	name = tokenizer_name(tokenizer)
+	if name not in word_caches: word_caches[name] = wordCache(tokenizer, path)
+	return word_caches[name]
+
+
+def encode_words(tokenizer, sentences, ranks, word_cache=None):
+	# subword ids of the sentences (lists of words) and ranks of the first subword of their target word.
+	# Each word is encoded separately, as with tokenizer(words) for the words of one sentence: the distinct words of all the sentences
+	# that are not in the word cache are encoded in one call, and the target subword ranks come from the offsets of the words in their sentence.
+	words = [word for sentence in sentences for word in sentence]
+	
+	encoded_words = {}
+	missing_words = []
+	for word in dict.fromkeys(words):
+		ids = word_cache.get(word) if word_cache is not None else None
+		if ids is None: missing_words.append(word)
+		else: encoded_words[word] = ids
+	
+	if missing_words:
+		for word, ids in zip(missing_words, tokenizer(missing_words, add_special_tokens=False)['input_ids']):
+			encoded_words[word] = ids
+			if word_cache is not None: word_cache.put(word, ids)
+	
+	words_encoded = [encoded_words[word] for word in words]
+	
+	sents_encoded = []
+	tg_trks = []
+	k = 0
+	for sentence, rank in zip(sentences, ranks):
+		sentence_encoded = words_encoded[k:k+len(sentence)]
+		k += len(sentence)
+		word_offsets = [0] + list(accumulate(len(word_encoded) for word_encoded in sentence_encoded))
+		sents_encoded.append([token for word_encoded in sentence_encoded for token in word_encoded])
+		tg_trks.append(word_offsets[rank])
+	
+	return sents_encoded, tg_trks
+
+
+def group_rows(df, column='sense_id'):
+	# positions in df of the rows of each value of the column, found in one pass over the column instead of filtering df for each value
+	return df.groupby(column, sort=False).indices
+
+
+def encode_sense_examples(tokenizer, df_examples, senses_ids, examples_rows=None):
+	# subword ids and target subword ranks of the examples of each sense, in one call of encode_words for all the senses.
+	# With examples_rows (group_rows of df_examples), the examples are gathered from their positions instead of filtering the whole frame
+	if examples_rows is None:
+		df_examples = df_examples[df_examples['sense_id'].isin(set(senses_ids))]
+	else:
+		positions = [examples_rows[sense_id] for sense_id in dict.fromkeys(senses_ids) if sense_id in examples_rows]
+		df_examples = df_examples.iloc[np.concatenate(positions) if positions else []]
+	sentences = [ x.split(' ') for x in df_examples['example'].tolist() ]
+	sents_encoded, tg_trks = encode_words(tokenizer, sentences, df_examples['word_rank'].tolist(), shared_word_cache(tokenizer))
+	
+	encoded_examples = defaultdict(lambda: ([], []))
+	for sense_id, sent_encoded, tg_trk in zip(df_examples['sense_id'].tolist(), sents_encoded, tg_trks):
+		encoded_examples[sense_id][0].append(sent_encoded)
+		encoded_examples[sense_id][1].append(tg_trk)
+	return encoded_examples
+
+
+def file_sha1(file_name):
+	sha1 = hashlib.sha1()
+	with open(file_name, 'rb') as f:
+		for block in iter(lambda: f.read(1 << 20), b''): sha1.update(block)
+	return sha1.hexdigest()
 
 
 class Encoder:
+	# arrays (with their type) and lists of the encoded dataset, saved by encode with a cache_dir
+	encoded_arrays = {}
+	encoded_lists = []
 	
 	def __init__(self, sense_datafile, ex_datafile, dataset, tokenizer, remove_demonyms=False, use_sample=False, sample_size=32):
 	
@@ -56,6 +182,7 @@ class Encoder:
 		self.dataset = dataset
 		self.use_sample = use_sample
 		self.sample_size = sample_size
+		self.remove_demonyms = remove_demonyms
 		
 		self.df_definitions = pd.read_csv(sense_datafile, sep='\t')
 		self.df_definitions = self.df_definitions[self.df_definitions['supersense'].isin(SUPERSENSES)]
@@ -133,19 +260,119 @@ class Encoder:
 		return sentences_with_special_tokens, rks
 	
 	
-	def encode(self):
+	def encode_data(self):
 		pass
 	
 	
+	def encoding_options(self):
+		# everything the encoded dataset depends on, apart from the input files
+		return [type(self).__name__, self.dataset, tokenizer_name(self.tokenizer), MAX_LENGTH, self.remove_demonyms, ENCODING_CACHE_VERSION]
+	
+	
+	def encoding_path(self, cache_dir):
+		sha1 = hashlib.sha1(json.dumps(self.encoding_options()).encode('utf-8'))
+		for file_name in [self.sense_datafile, self.ex_datafile]: sha1.update(file_sha1(file_name).encode('utf-8'))
+		return os.path.join(cache_dir, f"{type(self).__name__}-{self.dataset}-{sha1.hexdigest()[:16]}")
+	
+	
+	def encode(self, cache_dir=None):
+		# with a cache_dir, the encoded dataset is loaded from its directory there (memory-mapped) if a previous run saved it, 
+		# otherwise it is encoded and saved there. Samples are always encoded.
+		if cache_dir is None or self.use_sample: 
+			self.encode_data()
+			self.to_arrays()
+			return
+		
+		path = self.encoding_path(cache_dir)
+		if os.path.exists(path): 
+			self.load_encoded(path)
+		else:
+			self.encode_data()
+			self.to_arrays()
+			self.save_encoded(path)
+	
+	
+	def to_arrays(self):
+		# token ids, target ranks and supersenses are kept in arrays, that batches are gathered from
+		for name, dtype in self.encoded_arrays.items(): setattr(self, name, np.asarray(getattr(self, name), dtype=dtype))
+	
+	
+	def save_encoded(self, path):
+		# written in a temporary directory renamed at the end, a directory in the cache is always complete
+		tmp_path = f"{path}.tmp{os.getpid()}"
+		os.makedirs(tmp_path, exist_ok=True)
+		for name, dtype in self.encoded_arrays.items(): 
+			np.save(os.path.join(tmp_path, f"{name}.npy"), getattr(self, name))
+		with open(os.path.join(tmp_path, "lists.json"), 'w', encoding='utf-8') as f:
+			json.dump({name: list(getattr(self, name)) for name in self.encoded_lists}, f, ensure_ascii=False)
+		try:
+			os.replace(tmp_path, path)
+		except OSError:
+			# saved meanwhile by another run
+			shutil.rmtree(tmp_path)
+	
+	
+	def load_encoded(self, path):
+		for name in self.encoded_arrays: setattr(self, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r'))
+		with open(os.path.join(path, "lists.json"), encoding='utf-8') as f:
+			for name, values in json.load(f).items(): setattr(self, name, values)
+		self.length = len(self.supersenses_encoded)
+	
+	
+	def sequence_lengths(self, sentences):
+		# number of tokens of the [CLS] tokens [PAD]... [SEP] sentences that are not padding
+		return (sentences != PADDING_TOKEN_ID).sum(axis=1)
+	
+	
+	def trim_padding(self, sentences, lengths):
+		# pads the sentences of a batch to its longest sentence (plus a padding token, as with MAX_LENGTH) instead of MAX_LENGTH
+		width = min(lengths.max() + 1, MAX_LENGTH)
+		return np.concatenate([sentences[:, :width-1], sentences[:, -1:]], axis=1)
+	
+	
+	def attention_masks(self, sentences, lengths):
+		# without a mask, FlauBERT attends to as many positions as there are tokens that are not padding: the [CLS] token, the tokens, 
+		# and the first padding token instead of the [SEP] token after the padding. The masks keep these positions, so that 
+		# the classifiers give the same outputs with or without dynamic padding
+		return np.arange(sentences.shape[1]) < lengths[:, None]
+	
+	
+	def batches_indices(self, batch_size, shuffle_data=False, lengths=None):
+		# indices of the items of each batch, shuffled with a random permutation. Shuffled with their lengths, the items of a batch have similar lengths: 
+		# the shuffled items are split into buckets of BUCKET_SIZE batches and sorted by length in their bucket, then the batches of all the buckets are shuffled
+		nb_items = len(self.supersenses_encoded)
+		indices = np.random.permutation(nb_items) if shuffle_data else np.arange(nb_items)
+		if not shuffle_data or lengths is None: return [indices[k:k+batch_size] for k in range(0, nb_items, batch_size)]
+		
+		batches = []
+		bucket_size = batch_size * BUCKET_SIZE
+		for k in range(0, nb_items, bucket_size):
+			bucket = indices[k:k+bucket_size]
+			bucket = bucket[np.argsort(lengths[bucket], kind='stable')]
+			batches.extend(bucket[i:i+batch_size] for i in range(0, len(bucket), batch_size))
+		shuffle(batches)
+		return batches
+	
+	
+	def to_tensor(self, array, device):
+		# the arrays gathered for a batch are converted without going through python lists
+		return torch.from_numpy(array).to(device=device, dtype=torch.long)
+	
+	
 	def make_batches(self):
 		pass
 	
 	
 	def shuffle_data(self):
-		pass
+		# reorders the encoded dataset, make_batches shuffles the batches without reordering it
+		indices = np.random.permutation(len(self.supersenses_encoded))
+		for name in self.encoded_arrays: setattr(self, name, getattr(self, name)[indices])
+		for name in self.encoded_lists: setattr(self, name, [getattr(self, name)[i] for i in indices])
 	
 
 class definitionEncoder(Encoder):
+	encoded_arrays = {'definitions_with_lemma_encoded': np.int32, 'definitions_without_lemma_encoded': np.int32, 'supersenses_encoded': np.int16}
+	encoded_lists = ['lemmas', 'senses_ids']
 	
 	def __init__(self, sense_datafile, ex_datafile, dataset, tokenizer, remove_demonyms=False, use_sample=False, sample_size=32):
 		super().__init__(sense_datafile, ex_datafile, dataset, tokenizer, use_sample=use_sample, sample_size=sample_size, remove_demonyms=remove_demonyms)
@@ -173,7 +400,7 @@ class definitionEncoder(Encoder):
 		return new_instance
 		
 	
-	def encode(self):
+	def encode_data(self):
 		df_definitions = self.df_definitions
 		df_examples = self.df_examples
 		
@@ -206,20 +433,6 @@ class definitionEncoder(Encoder):
 		self.senses_ids = senses_ids
 	
 		
-	def shuffle_data(self):
-	
-		data = zip(self.definitions_with_lemma_encoded, self.definitions_without_lemma_encoded, self.supersenses_encoded, self.senses_ids, self.lemmas)
-		data = list(data)
-		shuffle(data)
-		definitions_with_lemma_encoded, definitions_without_lemma_encoded, supersenses_encoded, senses_ids, lemmas = zip(*data)
-		
-		self.definitions_with_lemma_encoded = definitions_with_lemma_encoded
-		self.definitions_without_lemma_encoded = definitions_without_lemma_encoded
-		self.supersenses_encoded = supersenses_encoded
-		self.lemmas = lemmas
-		self.senses_ids = senses_ids
-	
-	
 	def truncate_senses(self, k):
 		self.definitions_with_lemma_encoded = self.definitions_with_lemma_encoded[:k]
 		self.definitions_without_lemma_encoded = self.definitions_without_lemma_encoded[:k]
@@ -228,34 +441,43 @@ class definitionEncoder(Encoder):
 		self.senses_ids = self.senses_ids[:k]
 		self.length = k
 		
-	def make_batches(self, batch_size, device, shuffle_data=False):
-		if shuffle_data: self.shuffle_data()
-
-		k = 0
-		while k < len(self.supersenses_encoded):
-
-			start_idx = k
-			end_idx = k+batch_size if k+batch_size <= len(self.supersenses_encoded) else len(self.supersenses_encoded)
-			k += batch_size
-
-			b_definitions_with_lemma_encoded = self.definitions_with_lemma_encoded[start_idx:end_idx]
-			b_definitions_without_lemma_encoded = self.definitions_without_lemma_encoded[start_idx:end_idx]
-			b_supersenses_encoded = self.supersenses_encoded[start_idx:end_idx]
-			b_senses_ids = self.senses_ids[start_idx:end_idx]
-			b_lemmas = self.lemmas[start_idx:end_idx]
+	def make_batches(self, batch_size, device, shuffle_data=False, dynamic_padding=False):
+		# batches of definitions with their attention masks. With dynamic_padding, the definitions are padded to the longest definition 
+		# of their batch, and shuffled batches are made of definitions of similar lengths
+		lengths_with_lemma = self.sequence_lengths(self.definitions_with_lemma_encoded)
+		lengths_without_lemma = self.sequence_lengths(self.definitions_without_lemma_encoded)
+		
+		for indices in self.batches_indices(batch_size, shuffle_data, lengths_with_lemma if dynamic_padding else None):
 
-			b_definitions_with_lemma_encoded = torch.tensor(b_definitions_with_lemma_encoded).to(device)
-			b_definitions_without_lemma_encoded = torch.tensor(b_definitions_without_lemma_encoded).to(device)
-			b_supersenses_encoded = torch.tensor(b_supersenses_encoded).to(device)
+			b_definitions_with_lemma_encoded = self.definitions_with_lemma_encoded[indices]
+			b_definitions_without_lemma_encoded = self.definitions_without_lemma_encoded[indices]
+			b_supersenses_encoded = self.supersenses_encoded[indices]
+			b_senses_ids = [self.senses_ids[i] for i in indices]
+			b_lemmas = [self.lemmas[i] for i in indices]
 			
+			if dynamic_padding:
+				b_definitions_with_lemma_encoded = self.trim_padding(b_definitions_with_lemma_encoded, lengths_with_lemma[indices])
+				b_definitions_without_lemma_encoded = self.trim_padding(b_definitions_without_lemma_encoded, lengths_without_lemma[indices])
+			b_attention_masks_with_lemma = self.attention_masks(b_definitions_with_lemma_encoded, lengths_with_lemma[indices])
+			b_attention_masks_without_lemma = self.attention_masks(b_definitions_without_lemma_encoded, lengths_without_lemma[indices])
 
-			yield b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, b_senses_ids, b_lemmas
+			b_definitions_with_lemma_encoded = self.to_tensor(b_definitions_with_lemma_encoded, device)
+			b_definitions_without_lemma_encoded = self.to_tensor(b_definitions_without_lemma_encoded, device)
+			b_supersenses_encoded = self.to_tensor(b_supersenses_encoded, device)
+			b_attention_masks_with_lemma = self.to_tensor(b_attention_masks_with_lemma, device)
+			b_attention_masks_without_lemma = self.to_tensor(b_attention_masks_without_lemma, device)
+
+			yield b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, b_senses_ids, b_lemmas, b_attention_masks_with_lemma, b_attention_masks_without_lemma
 		
 
 
 class exampleEncoder(Encoder):
+	encoded_arrays = {'bert_input': np.int32, 'tg_trks': np.int16, 'supersenses_encoded': np.int16}
+	encoded_lists = ['senses_ids', 'lemmas']
+	
 	def __init__(self, sense_datafile, ex_datafile, dataset, tokenizer, use_sample=False, sample_size=32, sub_corpus=None):
 		super().__init__(sense_datafile, ex_datafile, dataset, tokenizer, use_sample=use_sample, sample_size=sample_size)
+		self.sub_corpus = sub_corpus
 		
 				
 		if sub_corpus:
@@ -265,15 +487,16 @@ class exampleEncoder(Encoder):
 				self.df_examples = self.df_examples[self.df_examples["sense_id"].str.contains('frsemcor')]
 		
 	
-	def encode(self):
+	def encoding_options(self):
+		return super().encoding_options() + [self.sub_corpus]
+	
+	
+	def encode_data(self):
 	
 		df_examples = self.df_examples
 		tokenizer = self.tokenizer
 		
 		examples = [ x.split(' ') for x in df_examples['example'].tolist() ]
-		for example in examples:
-			for x in example:
-				x = x.replace('##', ' ')
 		
 		supersenses = df_examples['supersense'].tolist()
 		senses_ids = df_examples['sense_id'].tolist()
@@ -282,10 +505,7 @@ class exampleEncoder(Encoder):
 		
 		self.length = len(supersenses)
 		
-		sents_encoded = [ tokenizer(word, add_special_tokens=False)['input_ids'] for word in examples ]
-		
-		tg_trks = [token_rank(sent, rank) for sent, rank in zip(sents_encoded, ranks)]
-		bert_input_raw = [ flatten_list(sent) for sent in sents_encoded ]
+		bert_input_raw, tg_trks = encode_words(tokenizer, examples, ranks, shared_word_cache(tokenizer))
 		bert_input_raw, tg_trks = self.truncate(bert_input_raw, tg_trks)
 		bert_input_raw = self.pad(bert_input_raw, pad_id=2)
 		bert_input, tg_trks = self.add_special_tokens(bert_input_raw, tg_trks, cls_id=0, sep_id=1)
@@ -297,41 +517,27 @@ class exampleEncoder(Encoder):
 		self.senses_ids = senses_ids
 		self.lemmas = lemmas
 		
-	def shuffle_data(self):
-	
-		data = zip(self.bert_input, self.tg_trks, self.supersenses_encoded, self.senses_ids, self.lemmas)
-		data = list(data)
-		shuffle(data)
-		bert_input, tg_trks, supersenses_encoded, senses_ids, lemmas = zip(*data)
-		
-		self.bert_input = bert_input
-		self.tg_trks = tg_trks
-		self.supersenses_encoded = supersenses_encoded
-		self.senses_ids = senses_ids
-		self.lemmas = lemmas
-		
+	def make_batches(self, batch_size, device, shuffle_data=False, dynamic_padding=False):
+		# batches of examples with their attention masks, padded as in definitionEncoder.make_batches
+		lengths = self.sequence_lengths(self.bert_input)
 		
-	def make_batches(self, batch_size, device, shuffle_data=False):
-		if shuffle_data: self.shuffle_data()
-
-		k = 0
-		while k < len(self.supersenses_encoded):
+		for indices in self.batches_indices(batch_size, shuffle_data, lengths if dynamic_padding else None):
 
-			start_idx = k
-			end_idx = k+batch_size if k+batch_size <= len(self.supersenses_encoded) else len(self.supersenses_encoded)
-			k += batch_size
-
-			b_bert_input = self.bert_input[start_idx:end_idx]
-			b_tg_trks = self.tg_trks[start_idx:end_idx]
-			b_supersenses_encoded = self.supersenses_encoded[start_idx:end_idx]
-			b_senses_ids = self.senses_ids[start_idx:end_idx]
-			b_lemmas = self.lemmas[start_idx:end_idx]
+			b_bert_input = self.bert_input[indices]
+			b_tg_trks = self.tg_trks[indices]
+			b_supersenses_encoded = self.supersenses_encoded[indices]
+			b_senses_ids = [self.senses_ids[i] for i in indices]
+			b_lemmas = [self.lemmas[i] for i in indices]
+			
+			if dynamic_padding: b_bert_input = self.trim_padding(b_bert_input, lengths[indices])
+			b_attention_masks = self.attention_masks(b_bert_input, lengths[indices])
 
-			b_bert_input = torch.tensor(b_bert_input).to(device)
-			b_tg_trks = torch.tensor(b_tg_trks).to(device)
-			b_supersenses_encoded = torch.tensor(b_supersenses_encoded).to(device)
+			b_bert_input = self.to_tensor(b_bert_input, device)
+			b_tg_trks = self.to_tensor(b_tg_trks, device)
+			b_supersenses_encoded = self.to_tensor(b_supersenses_encoded, device)
+			b_attention_masks = self.to_tensor(b_attention_masks, device)
 
-			yield b_bert_input, b_tg_trks, b_supersenses_encoded, b_senses_ids, b_lemmas
+			yield b_bert_input, b_tg_trks, b_supersenses_encoded, b_senses_ids, b_lemmas, b_attention_masks
 
 
 
@@ -347,36 +553,37 @@ class senseEncoder(Encoder):
 		
 		tokenizer = self.tokenizer
 		
-		for sense_id in self.senses_ids:
-			
-			definition = df_definitions[df_definitions['sense_id'] == sense_id]["definition"].iloc[0]
-			lemma = df_definitions[df_definitions['sense_id'] == sense_id]["lemma"].iloc[0]
-			supersense = df_definitions[df_definitions['sense_id'] == sense_id]["supersense"].iloc[0]
-			
-			definition_with_lemma_encoded = tokenizer.encode(text=f"{lemma.replace('_',' ')} : {definition}", add_special_tokens=True, return_tensors='pt')
-			
-			definition_without_lemma_encoded = tokenizer.encode(text=definition, add_special_tokens=True, return_tensors='pt')
-			
-			examples = df_examples[df_examples['sense_id'] == sense_id]['example'].tolist()
-			word_ranks = df_examples[df_examples['sense_id'] == sense_id]['word_rank'].tolist()
-			
-			examples = [ x.split(' ') for x in examples ]
-			for example in examples:
-				for x in example:
-					x = x.replace('##', ' ')
-
-			sents_encoded = [ tokenizer(word, add_special_tokens=False)['input_ids'] for word in examples ]
-			
-			tg_trks = [token_rank(sent, rank) for sent, rank in zip(sents_encoded, word_ranks)]
-			bert_input_raw = [ flatten_list(sent) for sent in sents_encoded ]
-			bert_input_examples, tg_trks_examples = self.add_special_tokens(bert_input_raw, tg_trks, cls_id=0, sep_id=1)
-			
-			definition_with_lemma_encoded = torch.tensor(definition_with_lemma_encoded).to(device)
-			definition_without_lemma_encoded = torch.tensor(definition_without_lemma_encoded).to(device)
-			tg_trks_examples = torch.tensor(tg_trks_examples).to(device)
-			bert_input_examples = [torch.tensor(bert_input).unsqueeze(0).to(device) for bert_input in bert_input_examples]
+		definitions_rows = group_rows(df_definitions)
+		examples_rows = group_rows(df_examples)
+		definitions = df_definitions['definition'].tolist()
+		lemmas = df_definitions['lemma'].tolist()
+		supersenses = df_definitions['supersense'].tolist()
+		
+		for start in range(0, len(self.senses_ids), ENCODING_CHUNK_SIZE):
 			
-			yield definition_with_lemma_encoded, definition_without_lemma_encoded, bert_input_examples, tg_trks_examples, supersense, sense_id, lemma
+			senses_ids = self.senses_ids[start:start+ENCODING_CHUNK_SIZE]
+			encoded_examples = encode_sense_examples(tokenizer, df_examples, senses_ids, examples_rows)
+		
+			for sense_id in senses_ids:
+				
+				row = definitions_rows[sense_id][0]
+				definition = definitions[row]
+				lemma = lemmas[row]
+				supersense = supersenses[row]
+				
+				definition_with_lemma_encoded = tokenizer.encode(text=f"{lemma.replace('_',' ')} : {definition}", add_special_tokens=True, return_tensors='pt')
+				
+				definition_without_lemma_encoded = tokenizer.encode(text=definition, add_special_tokens=True, return_tensors='pt')
+				
+				bert_input_raw, tg_trks = encoded_examples[sense_id]
+				bert_input_examples, tg_trks_examples = self.add_special_tokens(bert_input_raw, tg_trks, cls_id=0, sep_id=1)
+				
+				definition_with_lemma_encoded = torch.tensor(definition_with_lemma_encoded).to(device)
+				definition_without_lemma_encoded = torch.tensor(definition_without_lemma_encoded).to(device)
+				tg_trks_examples = torch.tensor(tg_trks_examples).to(device)
+				bert_input_examples = [torch.tensor(bert_input).unsqueeze(0).to(device) for bert_input in bert_input_examples]
+				
+				yield definition_with_lemma_encoded, definition_without_lemma_encoded, bert_input_examples, tg_trks_examples, supersense, sense_id, lemma
 
 
 
@@ -394,10 +601,10 @@ class wikiEncoder():
 		self.def_datafile = def_datafile
 		self.ex_datafile = ex_datafile
 		
-		self.df_definitions = pd.read_csv(def_datafile, sep='\t')
+		self.df_definitions = dataIO.read_table(def_datafile, columns=['lemma', 'sense_id', 'definition'])
 		self.df_definitions['lemma'] = self.df_definitions['lemma'].str.replace('_', ' ')
 		
-		self.df_examples = pd.read_csv(ex_datafile, sep='\t')
+		self.df_examples = dataIO.read_table(ex_datafile, columns=['sense_id', 'lemma', 'word_rank', 'example'])
 		self.df_examples = self.df_examples[self.df_examples['word_rank'] >= 0]
 		self.df_examples['lemma'] = self.df_examples['lemma'].str.replace('_', ' ')
 		
@@ -467,54 +674,51 @@ class wikiEncoder():
 		
 		tokenizer = self.tokenizer
 		
-		for sense_id in self.senses_ids:
-			
-			definition = df_definitions[df_definitions['sense_id'] == sense_id]["definition"].iloc[0]
-			if pd.isna(definition) or definition == '': definition = None
-			
-			lemma = df_definitions[df_definitions['sense_id'] == sense_id]["lemma"].iloc[0]
-			lemma = str(lemma)
-
+		# rows of each sense, so that each sense is found without going through all the senses and examples
+		definitions_rows = group_rows(df_definitions)
+		examples_rows = group_rows(df_examples)
+		definitions = df_definitions['definition'].tolist()
+		lemmas = df_definitions['lemma'].tolist()
+		
+		for start in range(0, len(self.senses_ids), ENCODING_CHUNK_SIZE):
 			
-			if definition: 
-				definition_with_lemma_encoded = tokenizer.encoded_input = tokenizer.encode_plus(
-																					text=f"{lemma.replace('_',' ')} : {definition}",
-																					add_special_tokens=True,
-																					max_length=100,  
-																					padding='max_length',  
-																					truncation=True,        
-																					return_tensors='pt'     
-																								)['input_ids']
+			senses_ids = self.senses_ids[start:start+ENCODING_CHUNK_SIZE]
+			encoded_examples = encode_sense_examples(tokenizer, df_examples, senses_ids, examples_rows)
+		
+			for sense_id in senses_ids:
 				
-			else:
-				definition_with_lemma_encoded = None
-			
-			examples = df_examples[df_examples['sense_id'] == sense_id]['example'].tolist()
-			word_ranks = df_examples[df_examples['sense_id'] == sense_id]['word_rank'].tolist()
-			
-			
-			examples = [ x.split(' ') for x in examples ]
-			for example in examples:
-				for x in example:
-					x = x.replace('##', ' ')
-			
-
-			sents_encoded = [ tokenizer(word, add_special_tokens=False)['input_ids'] for word in examples ]
-			
-			tg_trks = [token_rank(sent, rank) for sent, rank in zip(sents_encoded, word_ranks)]
-			
+				row = definitions_rows[sense_id][0]
+				definition = definitions[row]
+				if pd.isna(definition) or definition == '': definition = None
+				
+				lemma = lemmas[row]
+				lemma = str(lemma)
 
-			bert_input_raw = [ flatten_list(sent) for sent in sents_encoded ]
-			
-			bert_input_raw, tg_trks = self.truncate(bert_input_raw, tg_trks)
-			bert_input_raw = self.pad(bert_input_raw, pad_id=2)
-			
-			bert_input_examples, tg_trks_examples = self.add_special_tokens(bert_input_raw, tg_trks, cls_id=0, sep_id=1)
+				
+				if definition: 
+					definition_with_lemma_encoded = tokenizer.encoded_input = tokenizer.encode_plus(
+																						text=f"{lemma.replace('_',' ')} : {definition}",
+																						add_special_tokens=True,
+																						max_length=100,  
+																						padding='max_length',  
+																						truncation=True,        
+																						return_tensors='pt'     
+																									)['input_ids']
+					
+				else:
+					definition_with_lemma_encoded = None
+				
+				bert_input_raw, tg_trks = encoded_examples[sense_id]
+				
+				bert_input_raw, tg_trks = self.truncate(bert_input_raw, tg_trks)
+				bert_input_raw = self.pad(bert_input_raw, pad_id=2)
+				
+				bert_input_examples, tg_trks_examples = self.add_special_tokens(bert_input_raw, tg_trks, cls_id=0, sep_id=1)
 
-			
-			if definition: definition_with_lemma_encoded = torch.tensor(definition_with_lemma_encoded).to(device)
-			tg_trks_examples = torch.tensor(tg_trks_examples).to(device)
-			bert_input_examples = [torch.tensor(bert_input).unsqueeze(0).to(device) for bert_input in bert_input_examples]
-			
-			
-			yield definition_with_lemma_encoded, bert_input_examples, tg_trks_examples, sense_id, lemma
+				
+				if definition: definition_with_lemma_encoded = torch.tensor(definition_with_lemma_encoded).to(device)
+				tg_trks_examples = torch.tensor(tg_trks_examples).to(device)
+				bert_input_examples = [torch.tensor(bert_input).unsqueeze(0).to(device) for bert_input in bert_input_examples]
+				
+				
+				yield definition_with_lemma_encoded, bert_input_examples, tg_trks_examples, sense_id, lemma
@@ -0,0 +1,90 @@
+import pandas as pd
+import numpy as np
+
+
+# Tables of the pipeline are written as tsv files, or as parquet files when the file name ends with .parquet.
+# In parquet files, the example_i columns of a sense are stored as a single list column 'examples'
+# (trailing empty examples are dropped), and the other columns keep their types.
+# Reading a parquet file gives back the same frame as reading the equivalent tsv file.
+
+MAX_NB_EXAMPLES = 23
+EXAMPLE_COLUMNS = [f'example_{i}' for i in range(1, MAX_NB_EXAMPLES+1)]
+
+
+def is_parquet(file_name):
+	return str(file_name).endswith('.parquet')
+
+
+def examples_to_list(df):
+	example_columns = [column for column in EXAMPLE_COLUMNS if column in df.columns]
+	if not example_columns: return df
+
+	values = df[example_columns].to_numpy(dtype=object)
+	examples = []
+	for row in values:
+		row = ['' if pd.isna(example) else str(example) for example in row]
+		while row and not row[-1]: row.pop()
+		examples.append(row)
+
+	position = df.columns.get_loc(example_columns[0])
+	df = df.drop(columns=example_columns)
+	df.insert(position, 'examples', examples)
+	return df
+
+
+def list_to_examples(df, example_columns=EXAMPLE_COLUMNS):
+	if 'examples' not in df.columns: return df
+
+	examples = df['examples'].tolist()
+	position = df.columns.get_loc('examples')
+	df = df.drop(columns=['examples'])
+	for k, column in enumerate(example_columns):
+		n = int(column.split('_')[1]) - 1
+		df.insert(position + k, column, [row[n] if row is not None and n < len(row) and row[n] != '' else np.nan for row in examples])
+	return df
+
+
+def write_table(df, output_file):
+	if is_parquet(output_file):
+		examples_to_list(df).to_parquet(output_file, index=False)
+	else:
+		df.to_csv(output_file, sep='\t', index=False, encoding='utf-8')
+
+
+def parquet_columns(columns):
+	# columns to read from a parquet file, and example_i columns to rebuild from its 'examples' column
+	example_columns = EXAMPLE_COLUMNS if columns is None else [column for column in columns if column in EXAMPLE_COLUMNS]
+	if columns is None: return None, example_columns
+	
+	file_columns = [column for column in columns if column not in EXAMPLE_COLUMNS]
+	if example_columns: file_columns.append('examples')
+	return file_columns, example_columns
+
+
+def from_parquet(df, columns, example_columns):
+	df = list_to_examples(df, example_columns)
+	# empty strings are read as missing values from tsv files
+	df = df.replace('', np.nan)
+	if columns is not None: df = df[[column for column in columns if column in df.columns]]
+	return df
+
+
+def read_table(input_file, columns=None):
+	if not is_parquet(input_file):
+		return pd.read_csv(input_file, sep='\t', usecols=columns)
+
+	file_columns, example_columns = parquet_columns(columns)
+	df = pd.read_parquet(input_file, columns=file_columns)
+	return from_parquet(df, columns, example_columns)
+
+
+def read_table_chunks(input_file, chunk_size, columns=None):
+	# yields the frames of chunk_size consecutive rows of the table, without loading the whole file
+	if not is_parquet(input_file):
+		yield from pd.read_csv(input_file, sep='\t', usecols=columns, chunksize=chunk_size)
+		return
+
+	import pyarrow.parquet as pq
+	file_columns, example_columns = parquet_columns(columns)
+	for batch in pq.ParquetFile(input_file).iter_batches(batch_size=chunk_size, columns=file_columns):
+		yield from_parquet(batch.to_pandas(), columns, example_columns)
@@ -1,5 +1,6 @@
 import pandas as pd
 import argparse
+import dataIO
 
 
 SUPERSENSES = ['act', 'animal', 'artifact', 'attribute', 'body', 'cognition',
@@ -48,17 +49,17 @@ class_mapping = {
 if __name__ == "__main__":
 
 	parser = argparse.ArgumentParser(description="Generating wiktionary_preds.tsv using input Wiktionary tsv file and input Wiktionary examples tsv file.")
-	parser.add_argument('--input_wiktionary', required=True, help='Path to the input TSV file for the Wiktionary data.')
-	parser.add_argument('--input_preds', required=True, help='Path to the input TSV file for the predictions of each sense of the Wiktionary.')
-	parser.add_argument('--output', required=True, help='Path to the output TSV file of the enriched Wiktionary resource.')
+	parser.add_argument('--input_wiktionary', required=True, help='Path to the input TSV (or parquet) file for the Wiktionary data.')
+	parser.add_argument('--input_preds', required=True, help='Path to the input TSV (or parquet) file for the predictions of each sense of the Wiktionary.')
+	parser.add_argument('--output', required=True, help='Path to the output TSV file (or parquet file if it ends with .parquet) of the enriched Wiktionary resource.')
 
 	args = parser.parse_args()
 
 	wiktionnaire = args.input_wiktionary
 	wiktionnaire_preds = args.input_preds
 
-	df_wiki = pd.read_csv(wiktionnaire, sep='\t')
-	df_wiki_preds = pd.read_csv(wiktionnaire_preds, sep='\t')
+	df_wiki = dataIO.read_table(wiktionnaire)
+	df_wiki_preds = dataIO.read_table(wiktionnaire_preds)
 
 
 	class_mapping_df = pd.DataFrame(class_mapping).T.reset_index()
@@ -85,4 +86,4 @@ if __name__ == "__main__":
 	df_final[columns_to_convert] = df_final[columns_to_convert].astype(str)
 
 
-	df_final.to_csv(args.output, sep='\t', index=False, encoding='utf-8')
+	dataIO.write_table(df_final, args.output)
@@ -6,7 +6,6 @@ REPO_DIR=$(dirname "$0")
 OUT=$REPO_DIR/out
 MODEL_DIR=$OUT/models
 BZ2_FILE=${REPO_DIR}/fr_dbnary_ontolex_20240501.ttl.bz2
-DUMP_FILE=${OUT}/wiktionary.ttl
 WIKTIONARY_FILE=${OUT}/wiktionary.tsv
 EXAMPLES_FILE=${OUT}/wiktionary_examples.tsv
 PREDS_FILE=${OUT}/wiktionary_preds.tsv
@@ -55,20 +54,14 @@ if [ $? -ne 0 ]; then
 fi
 
 
-if [ -f "$BZ2_FILE" ]; then
-    echo "Extracting TTL file from $BZ2_FILE..."
-
-    bunzip2 -c "$BZ2_FILE" > "$DUMP_FILE"
-
-    echo "Extraction complete. TTL file saved to $DUMP_FILE"
-else
+if [ ! -f "$BZ2_FILE" ]; then
     echo "Error: $BZ2_FILE not found."
     exit 1
 fi
 
 
 echo "WIKTIONARY EXTRACTION..."
-python3 "$REPO_DIR/extract_wiki.py" --input "$DUMP_FILE" --output "$WIKTIONARY_FILE"
+python3 "$REPO_DIR/extract_wiki.py" --input "$BZ2_FILE" --output "$WIKTIONARY_FILE"
 if [ $? -ne 0 ]; then
     echo "Error in step 1: extract_wiki.py failed"
     exit 1
@@ -1,6 +1,22 @@
 import pandas as pd
 import numpy as np
 import argparse
+import dataIO
+import bz2
+import gzip
+import codecs
+import queue
+import threading
+import multiprocessing
+import os
+import re
+import functools
+import itertools
+import pickle
+import hashlib
+import sqlite3
+from collections import namedtuple
+from array import array
 
 
 
@@ -25,6 +41,8 @@ allowed_rdf_types = ["ontolex:LexicalSense",
                      "ontolex:Word",
                      "ontolex:MultiWordExpression"]
 
+entry_rdf_types = ["ontolex:LexicalEntry", "ontolex:Word", "ontolex:MultiWordExpression"]
+
 allowed_categories = ["lexinfo:noun", '"-nom-"', '"-nom-pr-"', "lexinfo:properNoun"]
 
 cat2pos = {"lexinfo:noun": "noun", '"-nom-"': "noun", '"-nom-pr-"': "proper_noun", "lexinfo:properNoun": "proper_noun"}
@@ -35,6 +53,17 @@ allowed_pos = ['noun', 'proper_noun']
 
 lang = "fra"
 
+# size of the decompressed byte blocks handed over by the reader thread
+READ_BLOCK_SIZE = 1 << 22
+
+# number of values buffered by a sqliteTable before they are written to the store
+STORE_BATCH_SIZE = 10000
+
+# number of byte ranges per worker process in the parallel mode, for load balancing
+RANGES_PER_WORKER = 4
+# number of paragraphs sent at once to a worker process when the dump is compressed
+PARAGRAPH_BATCH_SIZE = 20000
+
 def extract_labels_definition(text):
     if not text.strip():
         return None, None
@@ -69,242 +98,910 @@ def normalization_id(full_id, lang=lang):
         return full_id
 """
 
+@functools.lru_cache(maxsize=None)
+def id_prefixes(lang):
+    return lang + ":", "<http://kaiko.getalp.org/dbnary/" + lang + "/"
+
 def normalization_id(full_id, lang=lang):
-    prefix = lang + ":"
+    prefix, iri_prefix = id_prefixes(lang)
     if full_id.startswith(prefix):
-        return full_id[len(prefix):].lstrip('_').rstrip('_')
-    elif full_id.startswith("<http://kaiko.getalp.org/dbnary/" + lang + "/"):
-        prefix = "<http://kaiko.getalp.org/dbnary/" + lang + "/"
-        suffix = ">"
-        if full_id.endswith(suffix):
-            return full_id[len(prefix):-len(suffix)].lstrip('_').rstrip('_')
+        return full_id[len(prefix):].strip('_')
+    elif full_id.startswith(iri_prefix) and full_id.endswith(">"):
+        return full_id[len(iri_prefix):-1].strip('_')
     return full_id
 
+def local_name(term):
+    if term.startswith('<'):
+        return term[1:-1].rsplit('#', 1)[-1].rsplit('/', 1)[-1]
+    return term.partition(':')[2]
+
+
+# Turtle subset emitted by dbnary: prefixed names, IRIs, (long) string literals with a language tag or datatype,
+# object lists, predicate lists and blank nodes. Names are kept verbatim, literals are unescaped.
+Literal = namedtuple('Literal', ['value', 'lang'])
+
+# one token per match, preceded by any whitespace: punctuation, prefixed name, string literal, language tag, datatype marker or IRI
+turtle_token_re = re.compile(r'''\s*(
+	[;,\[\]().]
+	|(?:[^\s;,\[\]()"'<>\\.@^]|\\.)(?:[^\s;,\[\]()"'<>\\.]+|\\.|\.(?![\s;,\[\]()"'<>]|$))*
+	|"""(?:[^"\\]|\\.|"(?!""))*"""|"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'
+	|@[A-Za-z]+(?:-[A-Za-z0-9]+)*
+	|\^\^
+	|<[^>]*>
+	)''', re.VERBOSE)
+
+string_escape_re = re.compile(r'\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))', re.DOTALL)
+
+string_escapes = {'t': '\t', 'b': '\b', 'n': '\n', 'r': '\r', 'f': '\f'}
+
+allowed_relations_set = frozenset(allowed_relations)
+
+# a sense is ignored when one of these labels appears anywhere in its joined labels
+labels_to_ignore_re = re.compile('|'.join(re.escape(label) for label in labels_to_ignore))
+
+def unescape_escape(match):
+	code = match.group(1) or match.group(2)
+	if code: return chr(int(code, 16))
+	return string_escapes.get(match.group(3), match.group(3))
+
+def unescape_string(token):
+	text = token[3:-3] if token.startswith('"""') else token[1:-1]
+	if '\\' not in text: return text
+	return string_escape_re.sub(unescape_escape, text)
+
+def tokenize_turtle(text):
+	return turtle_token_re.findall(text)
+
+def parse_object(tokens, i):
+	token = tokens[i]
+	i += 1
+	if token[0] in '"\'':
+		lang = None
+		if i < len(tokens):
+			if tokens[i][0] == '@':
+				lang = tokens[i][1:]
+				i += 1
+			elif tokens[i] == '^^':
+				i += 2
+		return Literal(unescape_string(token), lang), i
+	if token == '[':
+		blank_node = {}
+		triples, i = parse_predicate_objects(tokens, i)
+		for predicate, obj in triples:
+			blank_node.setdefault(predicate, []).append(obj)
+		return blank_node, i
+	if token == '(':
+		collection = []
+		while i < len(tokens) and tokens[i] != ')':
+			obj, i = parse_object(tokens, i)
+			collection.append(obj)
+		return collection, i + 1
+	return token, i
+
+def parse_predicate_objects(tokens, i, relations=None):
+	# returns the (predicate, object) pairs of the relations, or of all predicates, up to the closing '.' or ']' and the index after it
+	triples = []
+	n = len(tokens)
+	while i < n:
+		token = tokens[i]
+		i += 1
+		if token == '.' or token == ']': break
+		if token == ';' or token == ',': continue
+		predicate = 'rdf:type' if token == 'a' else token
+		keep = relations is None or predicate in relations
+		while i < n:
+			obj, i = parse_object(tokens, i)
+			if keep: triples.append((predicate, obj))
+			if i < n and tokens[i] == ',': i += 1
+			else: break
+	return triples, i
+
+def parse_turtle(paragraph, relations=allowed_relations_set):
+	# subject and (predicate, object) pairs of the relations of a paragraph
+	tokens = tokenize_turtle('\n'.join(paragraph))
+	if not tokens: return None, []
+	triples, _ = parse_predicate_objects(tokens, 1, relations)
+	return tokens[0], triples
+
+def literal_value(obj):
+	# text of a literal object, or of the rdf:value of a blank node object
+	if isinstance(obj, dict):
+		values = obj.get('rdf:value')
+		obj = values[0] if values else None
+	if isinstance(obj, Literal): return obj.value
+	return None
+
+def category(obj):
+	if isinstance(obj, Literal): return '"' + obj.value + '"'
+	return obj
+
+page_relations = frozenset(["dbnary:describes"])
+entry_relations = frozenset(["lexinfo:partOfSpeech", "dbnary:partOfSpeech", "ontolex:canonicalForm", "ontolex:sense"])
+sense_relations = frozenset(["skos:definition", "skos:example"])
+form_relations = frozenset(["lexinfo:gender"])
+
 def parse_page(paragraph, wiki_data):
-	page = None
-	entry_ids = None
-	for i, line in enumerate(paragraph):
-		line = line.strip()
-		if i == 0:
-			page = normalization_id(line.split()[0])
-		if "dbnary:describes" in line:
-			entry_ids = [normalization_id(el.strip().strip(' .').strip().strip('.')) for el in line.split('dbnary:describes')[1].strip().split(" .")[0].strip().split(' , ') if el.strip('.').strip()]
+	page, triples = parse_turtle(paragraph, page_relations)
+	entry_ids = [normalization_id(obj) for predicate, obj in triples if predicate == "dbnary:describes" and isinstance(obj, str)] or None
 	if page: 
+		page = normalization_id(page)
 		wiki_data['pages'][page] = {'entry_ids':entry_ids}
+		return page
 	else:
 		raise TypeError("Page not found.")
 	# if not entry_ids and page not in ['main_page']: raise TypeError(f"Page '{page}' seems empty.")
 		
 		
 def parse_entry(paragraph, wiki_data):
-	entry = None
+	entry, triples = parse_turtle(paragraph, entry_relations)
 	pos = None
 	form_id = None
-	sense_ids = None
-	
-	for i, line in enumerate(paragraph):
-		line = line.strip()
-		if i == 0:
-			entry = normalization_id(line.split()[0])
-		if "partOfSpeech" in line:
-			for cat in allowed_categories:
-				if cat in line: pos = cat2pos[cat]
-		if "ontolex:canonicalForm" in line:
-			form_id = normalization_id(line.split("ontolex:canonicalForm")[1].strip(";").strip())
-		if "ontolex:sense" in line:
-			sense_ids = [normalization_id(el.strip().strip(' .').strip().strip('.')) for el in line.split('ontolex:sense')[1].strip().split(" .")[0].strip().split(' , ') if el.strip('.').strip()]
+	sense_ids = []
+	
+	for predicate, obj in triples:
+		if predicate in ("lexinfo:partOfSpeech", "dbnary:partOfSpeech"):
+			pos = cat2pos.get(category(obj), pos)
+		elif predicate == "ontolex:canonicalForm" and isinstance(obj, str):
+			form_id = normalization_id(obj)
+		elif predicate == "ontolex:sense" and isinstance(obj, str):
+			sense_ids.append(normalization_id(obj))
 	if entry:
-		wiki_data['entries'][entry] = {'pos':pos, 'form_id':form_id, 'sense_ids':sense_ids}
+		entry = normalization_id(entry)
+		wiki_data['entries'][entry] = {'pos':pos, 'form_id':form_id, 'sense_ids':sense_ids or None}
+		return entry
 	else:
 		raise TypeError("Entry not found.")
 	#if not sense_ids: raise TypeError(f"Entry '{entry}' seems empty.")
 	
 	
 def parse_sense(paragraph, wiki_data):
-	sense = None
+	sense, triples = parse_turtle(paragraph, sense_relations)
 	labels = None
 	definition = None
 	examples = []
-	end_mark = "@fr"
-	for i, line in enumerate(paragraph):
-		line = line.strip()
-		if i == 0:
-			sense = normalization_id(line.split()[0])
-		if "skos:definition" in line and "rdf:value" in line:
-			text = line.split('rdf:value')[1].strip().strip('"')
-			end_index = text.find(end_mark)
-			if end_index != -1: 
-				definition = text[:end_index].strip().strip('"').strip()
-			else:
-				definition = text.strip().strip(';').strip(']').strip('[').strip().strip('"').strip()
-			labels, definition = extract_labels_definition(definition)
-				
-		if "skos:example" in line and "rdf:value" in line:
-			text = line.split('rdf:value')[1].strip().strip('"')
-			end_index = text.find(end_mark)
-			if end_index != -1: 
-				example = text[:end_index].strip().strip('"').strip()
-			else:
-				example = text.strip().strip(';').strip(']').strip('[').strip().strip('"').strip()
-			examples.append(example)
+	
+	for predicate, obj in triples:
+		if predicate == "skos:definition":
+			text = literal_value(obj)
+			if text is not None: labels, definition = extract_labels_definition(text)
+		elif predicate == "skos:example":
+			text = literal_value(obj)
+			if text is not None: examples.append(text.strip())
 					
 	if sense:
+		sense = normalization_id(sense)
 		wiki_data['senses'][sense] = {'definition':definition, 'labels':labels, 'examples':examples}
+		return sense
 	else:
 		raise TypeError("Sense not found.")
 					
 				
 	
 def parse_form(paragraph, wiki_data):
-	form = None
+	form, triples = parse_turtle(paragraph, form_relations)
 	gender = None
-	for i, line in enumerate(paragraph):
-		line = line.strip()
-		if i == 0:
-			form = normalization_id(line.split()[0])
-		if "lexinfo:gender" in line:
-			gender = line.split("lexinfo:gender")[1].split('lexinfo:')[1].strip(';').strip()
+	for predicate, obj in triples:
+		if predicate == "lexinfo:gender" and isinstance(obj, str):
+			gender = local_name(obj)
 	if form:
+		form = normalization_id(form)
 		wiki_data['forms'][form] = {'gender':gender}
+		return form
 	else:
 		raise TypeError("Form not found.")
 	# if not gender: raise TypeError(f"Form '{form}' seems empty.")
 			
 def parse_paragraph(paragraph, rdf_type, wiki_data):
 	if rdf_type == "dbnary:Page":
-		parse_page(paragraph, wiki_data)
-	elif rdf_type in ["ontolex:LexicalEntry", "ontolex:Word", "ontolex:MultiWordExpression"]:
-		parse_entry(paragraph, wiki_data)
+		return parse_page(paragraph, wiki_data)
+	elif rdf_type in entry_rdf_types:
+		return parse_entry(paragraph, wiki_data)
 	elif rdf_type == "ontolex:LexicalSense":
-		parse_sense(paragraph, wiki_data)
+		return parse_sense(paragraph, wiki_data)
 	elif rdf_type == "ontolex:Form":
-		parse_form(paragraph, wiki_data)
+		return parse_form(paragraph, wiki_data)
 	else:
 		print(f"ERROR WITH RDF TYPE: {rdf_type}")
 
 
-def extract_wiki_data(input_file):
-	print("Extracting paragraphs of Wiktionary data from ttl file...")
+def open_dump(input_file):
+	if input_file.endswith('.bz2'):
+		return bz2.open(input_file, 'rb')
+	elif input_file.endswith('.gz'):
+		return gzip.open(input_file, 'rb')
+	elif input_file.endswith('.zst'):
+		try:
+			import zstandard
+		except ImportError:
+			raise ImportError("Reading a .zst dump requires the zstandard package (pip install zstandard).")
+		return zstandard.open(input_file, 'rb')
+	else:
+		return open(input_file, 'rb')
+
+
+def read_blocks(input_file, blocks):
+	# runs in a background thread: bz2/gzip/zstd release the GIL while decompressing
+	try:
+		with open_dump(input_file) as stream:
+			while True:
+				block = stream.read(READ_BLOCK_SIZE)
+				if not block: break
+				blocks.put(block)
+	except Exception as e:
+		blocks.put(e)
+	blocks.put(None)
+
+
+def read_byte_blocks(input_file):
+	blocks = queue.Queue(maxsize=8)
+	reader = threading.Thread(target=read_blocks, args=(input_file, blocks), daemon=True)
+	reader.start()
+	
+	while True:
+		block = blocks.get()
+		if block is None: break
+		if isinstance(block, Exception): raise block
+		yield block
+
+
+def read_lines(input_file):
+	decoder = codecs.getincrementaldecoder('utf-8')()
+	tail = ''
+	for block in read_byte_blocks(input_file):
+		lines = (tail + decoder.decode(block)).split('\n')
+		tail = lines.pop()
+		for line in lines:
+			yield line
+	tail += decoder.decode(b'', final=True)
+	if tail: yield tail
+
+
+@functools.lru_cache(maxsize=None)
+def rdf_type_line_re(rdf_types):
+	# a line holding rdf:type followed by one of the rdf types, as the objects of the rdf:type predicate are written
+	return re.compile(b'rdf:type[^\n]*(?:' + b'|'.join(re.escape(rdf_type.encode('utf-8')) for rdf_type in rdf_types) + b')')
 
-	with open(input_file, 'r', encoding='utf-8') as file:
-		nb_paragraphs = 0
-		add_paragraph = False
-		rdf_type = None
-		paragraph = []
-		wiki_data = {"pages":{}, "entries":{}, "senses":{}, "forms":{}}
+# a whitespace only line, ending a paragraph
+blank_line_re = re.compile(rb'\n[ \t\r\f\v]*\n')
+
+def last_blank_line_end(buffer, start, end):
+	# end of the last empty line in buffer[start:end], or -1
+	lf = buffer.rfind(b'\n\n', start, end)
+	crlf = buffer.rfind(b'\n\r\n', max(lf, start), end)
+	if crlf >= 0: return crlf + 3
+	return lf + 2 if lf >= 0 else -1
+
+def prefilter_runs(blocks, rdf_types=None):
+	# text of the dump read from byte blocks, without the parts between blank lines that have no rdf:type line with one
+	# of the rdf types: these parts cannot hold a paragraph kept by iter_paragraphs and are skipped without being decoded.
+	# The other parts are decoded by runs of adjacent parts, each run ends with the blank line of its last part.
+	type_line_re = rdf_type_line_re(tuple(rdf_types or allowed_rdf_types))
+	buffer = b''
+	for block in blocks:
+		buffer += block
+		limit = last_blank_line_end(buffer, 0, len(buffer))
+		if limit < 0: continue
 		
-		for i, line in enumerate(file):
+		# position is the start of a line after a blank line
+		position = 0
+		run_start = run_end = 0
+		for match in type_line_re.finditer(buffer, 0, limit):
+			# a later rdf:type line of a part already kept
+			if match.start() < position: continue
+			
+			line_start = buffer.rfind(b'\n', position, match.start()) + 1 or position
+			start = last_blank_line_end(buffer, position, line_start)
+			if start < 0: start = position
+			blank_line = blank_line_re.search(buffer, match.end(), limit)
+			end = blank_line.end() if blank_line is not None else limit
+			
+			if start != run_end:
+				if run_end > run_start: yield buffer[run_start:run_end - 1].decode('utf-8')
+				run_start = start
+			run_end = position = end
+		if run_end > run_start: yield buffer[run_start:run_end - 1].decode('utf-8')
+		buffer = buffer[limit:]
+	
+	# the end of the dump, as read_lines gives it
+	if type_line_re.search(buffer):
+		text = buffer.decode('utf-8')
+		yield text[:-1] if text.endswith('\n') else text
+
+
+def prefilter_lines(blocks, rdf_types=None):
+	return itertools.chain.from_iterable(run.split('\n') for run in prefilter_runs(blocks, rdf_types))
+
+
+def iter_paragraphs(lines):
+	add_paragraph = False
+	rdf_type = None
+	paragraph = []
+	
+	for line in lines:
+	
+		if line.startswith('@prefix'): continue
+
+		elif not line.strip() and len(paragraph)>0:
 		
-			if line.startswith('@prefix'): continue
+			if add_paragraph:
+				yield rdf_type, paragraph
+				
+			add_paragraph = False
+			paragraph = []
+			rdf_type = None
 
-			elif not line.strip() and len(paragraph)>0:
+		else:
+			line = line.strip()
 			
-				if add_paragraph:
-					parse_paragraph(paragraph, rdf_type, wiki_data)
-					nb_paragraphs += 1
-					
-				add_paragraph = False
-				paragraph = []
-				rdf_type = None
+			if "rdf:type" in line:
+				for rdf in allowed_rdf_types:
+					if rdf in line:
+						add_paragraph = True
+						rdf_type = rdf
+						break
+						
+			if line.strip(): paragraph.append(line)
 
-			else:
-				line = line.strip()
-				
-				if "rdf:type" in line:
-					for rdf in allowed_rdf_types:
-						if rdf in line:
-							add_paragraph = True
-							rdf_type = rdf
-							break
-							
-				if line.strip(): paragraph.append(line)
-
-			# if i >= 76: break
+
+class sqliteTable:
+	# dict-like table of pickled values in a SQLite file, iterated in insertion order like a dict
+	
+	def __init__(self, connection, name):
+		self.connection = connection
+		self.name = name
+		self.pending = {}
+		connection.execute(f"DROP TABLE IF EXISTS {name}")
+		connection.execute(f"CREATE TABLE {name} (id TEXT PRIMARY KEY, value BLOB)")
+	
+	def flush(self):
+		if not self.pending: return
+		rows = [(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)) for key, value in self.pending.items()]
+		# an id seen again keeps its rowid, hence its position, and takes the new value
+		self.connection.executemany(f"INSERT OR IGNORE INTO {self.name} (id, value) VALUES (?, ?)", rows)
+		self.connection.executemany(f"UPDATE {self.name} SET value = ? WHERE id = ?", [(value, key) for key, value in rows])
+		self.connection.commit()
+		self.pending = {}
+	
+	def __setitem__(self, key, value):
+		self.pending[key] = value
+		if len(self.pending) >= STORE_BATCH_SIZE: self.flush()
+	
+	def __delitem__(self, key):
+		self.pending.pop(key, None)
+		self.connection.execute(f"DELETE FROM {self.name} WHERE id = ?", (key,))
+	
+	def get(self, key, default=None):
+		if key in self.pending: return self.pending[key]
+		row = self.connection.execute(f"SELECT value FROM {self.name} WHERE id = ?", (key,)).fetchone()
+		return pickle.loads(row[0]) if row else default
+	
+	def __getitem__(self, key):
+		value = self.get(key, missing)
+		if value is missing: raise KeyError(key)
+		return value
+	
+	def __contains__(self, key):
+		return self.get(key, missing) is not missing
+	
+	def __len__(self):
+		self.flush()
+		return self.connection.execute(f"SELECT COUNT(*) FROM {self.name}").fetchone()[0]
+	
+	def __iter__(self):
+		self.flush()
+		for (key,) in self.connection.execute(f"SELECT id FROM {self.name} ORDER BY rowid"):
+			yield key
+	
+	def items(self):
+		self.flush()
+		for key, value in self.connection.execute(f"SELECT id, value FROM {self.name} ORDER BY rowid"):
+			yield key, pickle.loads(value)
+	
+	def values(self):
+		for _, value in self.items():
+			yield value
+	
+	def update(self, mapping):
+		for key, value in mapping.items():
+			self[key] = value
+
+
+missing = object()
+
+
+class stringTable:
+	# one string per integer handle, shared by the interned tables of an extraction
+	
+	def __init__(self):
+		self.handles = {}
+		self.strings = []
+	
+	def intern(self, string):
+		handle = self.handles.get(string)
+		if handle is None:
+			handle = self.handles[string] = len(self.strings)
+			self.strings.append(string)
+		return handle
+	
+	def handle(self, string):
+		return self.handles.get(string, -1)
+
+
+class internedTable:
+	# dict-like table keyed by interned ids, iterated in insertion order like a dict.
+	# rows[handle] is the row of the current value of an id (-1 if absent), order lists the handles in insertion order
+	# and positions[handle] is the index of a handle in order, so that stale entries of deleted ids can be skipped.
+	# Subclasses store their values in arrays by row with encode_value and rebuild them with decode_value.
+	
+	def __init__(self, strings):
+		self.strings = strings
+		self.rows = array('i')
+		self.positions = array('i')
+		self.order = array('i')
+		self.size = 0
+		self.nb_rows = 0
+	
+	def row(self, handle):
+		return self.rows[handle] if 0 <= handle < len(self.rows) else -1
+	
+	def __setitem__(self, key, value):
+		handle = self.strings.intern(key)
+		if handle >= len(self.rows):
+			grow = array('i', [-1]) * (max(handle + 1, 2 * len(self.rows)) - len(self.rows))
+			self.rows.extend(grow)
+			self.positions.extend(grow)
+		if self.rows[handle] < 0:
+			self.positions[handle] = len(self.order)
+			self.order.append(handle)
+			self.size += 1
+		self.encode_value(value)
+		self.rows[handle] = self.nb_rows
+		self.nb_rows += 1
+	
+	def __delitem__(self, key):
+		handle = self.strings.handle(key)
+		if self.row(handle) < 0: raise KeyError(key)
+		self.rows[handle] = -1
+		self.size -= 1
+	
+	def get(self, key, default=None):
+		row = self.row(self.strings.handle(key))
+		return self.decode_value(row) if row >= 0 else default
+	
+	def __getitem__(self, key):
+		value = self.get(key, missing)
+		if value is missing: raise KeyError(key)
+		return value
+	
+	def __contains__(self, key):
+		return self.row(self.strings.handle(key)) >= 0
+	
+	def __len__(self):
+		return self.size
+	
+	def handle_rows(self):
+		rows = self.rows
+		positions = self.positions
+		for position, handle in enumerate(self.order):
+			row = rows[handle]
+			if row >= 0 and positions[handle] == position:
+				yield handle, row
+	
+	def __iter__(self):
+		strings = self.strings.strings
+		for handle, _ in self.handle_rows():
+			yield strings[handle]
+	
+	def items(self):
+		strings = self.strings.strings
+		for handle, row in self.handle_rows():
+			yield strings[handle], self.decode_value(row)
+	
+	def values(self):
+		for _, value in self.items():
+			yield value
+	
+	def update(self, mapping):
+		for key, value in mapping.items():
+			self[key] = value
+
+
+class adjacency:
+	# CSR adjacency: the handles of row r are targets[offsets[r]:offsets[r+1]]
+	
+	def __init__(self):
+		self.offsets = array('i', [0])
+		self.targets = array('i')
+	
+	def append(self, handles):
+		self.targets.extend(handles)
+		self.offsets.append(len(self.targets))
+	
+	def __getitem__(self, row):
+		return self.targets[self.offsets[row]:self.offsets[row + 1]]
+
+
+class pageTable(internedTable):
+	
+	def __init__(self, strings):
+		super().__init__(strings)
+		self.entries = adjacency()
+	
+	def encode_value(self, page):
+		self.entries.append(self.strings.intern(entry_id) for entry_id in page['entry_ids'] or [])
+	
+	def decode_value(self, row):
+		strings = self.strings.strings
+		return {'entry_ids': [strings[handle] for handle in self.entries[row]] or None}
+
+
+# parts of speech of the entries, by code
+pos_codes = [None] + sorted(set(cat2pos.values()))
+pos2code = {pos: code for code, pos in enumerate(pos_codes)}
+
+class entryTable(internedTable):
+	
+	def __init__(self, strings):
+		super().__init__(strings)
+		self.pos = array('b')
+		self.forms = array('i')
+		self.senses = adjacency()
+	
+	def encode_value(self, entry):
+		self.pos.append(pos2code[entry['pos']])
+		self.forms.append(self.strings.intern(entry['form_id']) if entry['form_id'] else -1)
+		self.senses.append(self.strings.intern(sense_id) for sense_id in entry['sense_ids'] or [])
+	
+	def decode_value(self, row):
+		strings = self.strings.strings
+		form = self.forms[row]
+		return {'pos': pos_codes[self.pos[row]], 'form_id': strings[form] if form >= 0 else None,
+		        'sense_ids': [strings[handle] for handle in self.senses[row]] or None}
+
+
+class senseTable(internedTable):
+	# the definitions, labels and examples are content, they are kept as they are in tuples
+	
+	def __init__(self, strings):
+		super().__init__(strings)
+		self.senses = []
+	
+	def encode_value(self, sense):
+		labels = tuple(sense['labels']) if sense['labels'] is not None else None
+		self.senses.append((sense['definition'], labels, tuple(sense['examples'])))
+	
+	def decode_value(self, row):
+		definition, labels, examples = self.senses[row]
+		return {'definition': definition, 'labels': set(labels) if labels is not None else None, 'examples': list(examples)}
+
+
+class formTable(internedTable):
+	
+	def __init__(self, strings):
+		super().__init__(strings)
+		self.genders = array('i')
+	
+	def encode_value(self, form):
+		self.genders.append(self.strings.intern(form['gender']) if form['gender'] else -1)
+	
+	def decode_value(self, row):
+		gender = self.genders[row]
+		return {'gender': self.strings.strings[gender] if gender >= 0 else None}
+
+
+def new_wiki_data(store=None, intern=False):
+	if intern:
+		if store is not None: raise ValueError("Interned ids are held in memory and cannot be used with a store.")
+		strings = stringTable()
+		return {"pages":pageTable(strings), "entries":entryTable(strings), "senses":senseTable(strings), "forms":formTable(strings)}
+	if store is None:
+		return {"pages":{}, "entries":{}, "senses":{}, "forms":{}}
+	connection = sqlite3.connect(store)
+	connection.execute("PRAGMA journal_mode = OFF")
+	connection.execute("PRAGMA synchronous = OFF")
+	return {name: sqliteTable(connection, name) for name in ["pages", "entries", "senses", "forms"]}
+
+
+def paragraph_subject(paragraph):
+	return normalization_id(paragraph[0].split()[0])
+
+
+def parse_paragraphs(paragraphs, wiki_data=None, rdf_types=None, subject_ids=None, entry_pos=None, page_entry_ids=None):
+	# the optional filters restrict the parsed paragraphs to some rdf types, the senses and forms to some ids,
+	# the entries to some parts of speech and the pages to those describing at least one of some entries
+	if wiki_data is None: wiki_data = new_wiki_data()
+	for rdf_type, paragraph in paragraphs:
+		if rdf_types is not None and rdf_type not in rdf_types: continue
+		if subject_ids is not None and rdf_type in ("ontolex:LexicalSense", "ontolex:Form") and paragraph_subject(paragraph) not in subject_ids: continue
+		
+		subject = parse_paragraph(paragraph, rdf_type, wiki_data)
+		
+		if entry_pos is not None and rdf_type in entry_rdf_types:
+			if wiki_data['entries'][subject]['pos'] not in entry_pos: del wiki_data['entries'][subject]
+		elif page_entry_ids is not None and rdf_type == "dbnary:Page":
+			if not any(entry_id in page_entry_ids for entry_id in wiki_data['pages'][subject]['entry_ids'] or []): del wiki_data['pages'][subject]
+	return wiki_data
+
+
+def merge_wiki_data(wiki_data, partial_data):
+	# partial maps are merged in file order, so a later paragraph with the same id wins as in the sequential mode
+	for key in wiki_data:
+		wiki_data[key].update(partial_data[key])
+
+
+def is_compressed(input_file):
+	return input_file.endswith(('.bz2', '.gz', '.zst'))
+
+
+def paragraph_boundary(file, offset):
+	# first offset >= offset that starts a line right after a blank line
+	file.seek(offset)
+	if offset > 0: file.readline()
+	while True:
+		line = file.readline()
+		if not line: return file.tell()
+		if not line.strip(): return file.tell()
+
+
+def split_ranges(input_file, nb_ranges):
+	size = os.path.getsize(input_file)
+	boundaries = [0]
+	with open(input_file, 'rb') as file:
+		for k in range(1, nb_ranges):
+			boundary = paragraph_boundary(file, max(size * k // nb_ranges, boundaries[-1]))
+			if boundary > boundaries[-1] and boundary < size: boundaries.append(boundary)
+	boundaries.append(size)
+	return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def read_range_blocks(input_file, start, end):
+	with open(input_file, 'rb') as file:
+		file.seek(start)
+		position = start
+		while position < end:
+			block = file.read(min(READ_BLOCK_SIZE, end - position))
+			if not block: break
+			position += len(block)
+			yield block
+
+
+# paragraph filters of the current extraction pass, set once in each worker process
+worker_selection = {}
+
+def set_worker_selection(selection):
+	global worker_selection
+	worker_selection = selection
+
+
+def parse_range(args):
+	input_file, start, end = args
+	lines = prefilter_lines(read_range_blocks(input_file, start, end), worker_selection.get('rdf_types'))
+	return parse_paragraphs(iter_paragraphs(lines), **worker_selection)
+
+
+def parse_batch(paragraphs):
+	return parse_paragraphs(paragraphs, **worker_selection)
+
+
+def batch_paragraphs(paragraphs, batch_size):
+	batch = []
+	for paragraph in paragraphs:
+		batch.append(paragraph)
+		if len(batch) >= batch_size:
+			yield batch
+			batch = []
+	if batch: yield batch
+
+
+def extract_paragraphs(input_file, wiki_data, workers=1, **selection):
+	if workers <= 1:
+		lines = prefilter_lines(read_byte_blocks(input_file), selection.get('rdf_types'))
+		return parse_paragraphs(iter_paragraphs(lines), wiki_data, **selection)
+	
+	with multiprocessing.Pool(workers, initializer=set_worker_selection, initargs=(selection,)) as pool:
+		if is_compressed(input_file):
+			# a compressed stream cannot be split by byte offsets: paragraphs are read here and parsed in batches by the workers
+			lines = prefilter_lines(read_byte_blocks(input_file), selection.get('rdf_types'))
+			batches = batch_paragraphs(iter_paragraphs(lines), PARAGRAPH_BATCH_SIZE)
+			partials = pool.imap(parse_batch, batches)
+		else:
+			ranges = [(input_file, start, end) for start, end in split_ranges(input_file, workers * RANGES_PER_WORKER)]
+			partials = pool.imap(parse_range, ranges)
+			
+		for partial_data in partials:
+			merge_wiki_data(wiki_data, partial_data)
+			
 	return wiki_data
+
+
+def extract_wiki_data(input_file, workers=1, selective=False, store=None, intern=False):
+	print("Extracting paragraphs of Wiktionary data from ttl file...")
 	
+	wiki_data = new_wiki_data(store, intern)
+
+	if not selective:
+		return extract_paragraphs(input_file, wiki_data, workers)
+	
+	# first pass: entries with an allowed part of speech, and the ids of their senses and forms
+	extract_paragraphs(input_file, wiki_data, workers, rdf_types=entry_rdf_types, entry_pos=allowed_pos)
+	
+	entry_ids = set()
+	subject_ids = set()
+	for entry_id, entry in wiki_data['entries'].items():
+		entry_ids.add(entry_id)
+		if entry['sense_ids']: subject_ids.update(entry['sense_ids'])
+		if entry['form_id']: subject_ids.add(entry['form_id'])
+	print(f"Selected {len(entry_ids)} entries, {len(subject_ids)} senses and forms.")
+	
+	# second pass: pages describing these entries and the selected senses and forms only
+	return extract_paragraphs(input_file, wiki_data, workers, rdf_types=("dbnary:Page", "ontolex:LexicalSense", "ontolex:Form"), subject_ids=subject_ids, page_entry_ids=entry_ids)
 	
-def data2df(wiki_data, output_file):
 	
-	columns = ['lemma', 'entry_id', 'sense_id', 'supersense', 'hypersense', 'pos', 'gender', 'labels', 'definition'] + [f'example_{i}' for i in range(1, 24)]
+def output_sense(definition, labels, examples):
+	# labels, definition and examples of a sense in the output, None if the sense is filtered out
+	labels_str = " , ".join(labels) if labels else ''
+	if labels_to_ignore_re.search(labels_str): return None
 	
-	rows = []
+	definition = definition or ''
+	examples = examples[:MAX_NB_EXAMPLES]
+	nb_examples = sum(1 for example in examples if example)
+	if not definition and nb_examples == 0: return None
+	return labels_str, definition, examples
+
+
+def join_senses(wiki_data):
+	# output rows of the senses of the noun entries of each page, in page order
+	pages = wiki_data['pages']
+	entries = wiki_data['entries']
+	senses = wiki_data['senses']
+	forms = wiki_data['forms']
 	
+	for page_id, page in pages.items():
+		for entry_id in page["entry_ids"] or []:
+			entry = entries.get(entry_id)
+			if entry is None or entry['pos'] not in allowed_pos: continue
+			
+			form = forms.get(entry['form_id']) if entry['form_id'] else None
+			gender = form['gender'] if form is not None and form['gender'] else ''
+			
+			for sense_id in entry['sense_ids'] or []:
+				sense = senses.get(sense_id)
+				if sense is None: continue
+				
+				row = output_sense(sense['definition'], sense['labels'], sense['examples'])
+				if row is None: continue
+				yield (page_id, entry_id, sense_id, entry['pos'], gender) + row
+
+
+def join_interned_senses(wiki_data):
+	# same join as join_senses on the handles and arrays of interned tables, ids are only decoded for the output rows
 	pages = wiki_data['pages']
 	entries = wiki_data['entries']
 	senses = wiki_data['senses']
 	forms = wiki_data['forms']
+	strings = pages.strings.strings
+	allowed_codes = {pos2code[pos] for pos in allowed_pos}
 	
-	for page_id in pages:
-		page = pages[page_id]
-		entry_ids = page["entry_ids"]
-		# print("PAGE: ", page_id)
-		if entry_ids:
-			for entry_id in entry_ids:
-				if entry_id in entries:
-					gender = None
-					# print("ENTRY: ", entry_id)
-					entry = entries[entry_id]
-					pos = entry['pos']
-					form_id = entry['form_id']
-					if form_id in forms: gender = forms[form_id]['gender']
-					sense_ids = entry['sense_ids']
-					# print("POS: ", pos)
-					# print("GENDER: ", gender)
-					if sense_ids:
-						for sense_id in sense_ids:
-							if sense_id in senses:
-								# print("SENSE: ", sense_id)
-								sense = senses[sense_id]
-								labels = sense['labels']
-								labels_str = " , ".join(labels) if labels else None
-								definition = sense['definition']
-								examples = sense['examples']
-								# for k, label in enumerate(labels): print(f"LABEL_{k+1}: ", label)
-								# print("DEFINITION: ", definition)
-								# for j, example in enumerate(examples): print(f"EXAMPLE_{j+1}", example)
-								
-								row_data = {
-								'lemma': page_id, 
-								'entry_id': entry_id, 
-								'sense_id': sense_id, 
-								'pos': pos,
-								'gender': gender,
-								'labels': labels_str,
-								'definition': definition}
-								for n, example in enumerate(examples): row_data[f'example_{n+1}'] = example
-								rows.append(row_data)
-
-	df = pd.DataFrame(rows, columns=columns)
-	df = df.fillna(np.nan)
-	
-
-	df = df[df['pos'].isin(allowed_pos) & df['pos'].notna()]
-
-	def contains_labels_to_ignore(labels, labels_to_ignore):
-		return any(label in labels for label in labels_to_ignore)
-	
-	df = df.astype(str)
-	df.replace('nan', '', inplace=True)
-	df = df[~df['labels'].apply(lambda x: contains_labels_to_ignore(x, labels_to_ignore))]
-
-	example_columns = [col for col in df.columns if col.startswith('example')]
-	df = df[~((df['definition'] == '') & df[example_columns].apply(lambda row: row.eq('').all(), axis=1))]
-
-	df.reset_index(drop=True, inplace=True)
-	
-	df.to_csv(output_file, sep='\t', index=False)
+	for page, page_row in pages.handle_rows():
+		for entry in pages.entries[page_row]:
+			entry_row = entries.row(entry)
+			if entry_row < 0 or entries.pos[entry_row] not in allowed_codes: continue
+			
+			form_row = forms.row(entries.forms[entry_row])
+			gender = forms.genders[form_row] if form_row >= 0 else -1
+			gender = strings[gender] if gender >= 0 else ''
+			
+			for sense in entries.senses[entry_row]:
+				sense_row = senses.row(sense)
+				if sense_row < 0: continue
+				
+				row = output_sense(*senses.senses[sense_row])
+				if row is None: continue
+				yield (strings[page], strings[entry], strings[sense], pos_codes[entries.pos[entry_row]], gender) + row
+
+
+def data2df(wiki_data, output_file):
+	
+	example_columns = [f'example_{i}' for i in range(1, MAX_NB_EXAMPLES+1)]
+	columns = ['lemma', 'entry_id', 'sense_id', 'supersense', 'hypersense', 'pos', 'gender', 'labels', 'definition'] + example_columns
+	
+	# the frame is built column by column, senses filtered out are never materialised as rows
+	data = {column: [] for column in columns}
+	example_data = [data[column] for column in example_columns]
+	
+	join = join_interned_senses if isinstance(wiki_data['pages'], internedTable) else join_senses
+	for page_id, entry_id, sense_id, pos, gender, labels_str, definition, examples in join(wiki_data):
+		data['lemma'].append(page_id)
+		data['entry_id'].append(entry_id)
+		data['sense_id'].append(sense_id)
+		data['supersense'].append('')
+		data['hypersense'].append('')
+		data['pos'].append(pos)
+		data['gender'].append(gender)
+		data['labels'].append(labels_str)
+		data['definition'].append(definition)
+		for n, column_data in enumerate(example_data):
+			column_data.append(examples[n] if n < len(examples) else '')
+
+	df = pd.DataFrame(data, columns=columns)
+	
+	dataIO.write_table(df, output_file)
+	
+	return df
 						
 
 
+def sense_hashes(df):
+	# content hash of each sense over the fields that matter downstream; labels are sorted since their order is not stable
+	example_columns = [f'example_{i}' for i in range(1, MAX_NB_EXAMPLES+1)]
+	df = df[['sense_id', 'pos', 'gender', 'labels', 'definition'] + example_columns].fillna('').astype(str)
+	
+	hashes = {}
+	for sense_id, pos, gender, labels, definition, *examples in df.itertuples(index=False):
+		labels = " , ".join(sorted(labels.split(" , "))) if labels else ''
+		content = '\x1f'.join([definition, labels, pos, gender] + [example for example in examples if example])
+		hashes[sense_id] = hashlib.sha1(content.encode('utf-8')).hexdigest()
+	return hashes
+
+
+def read_sense_hashes(input_file):
+	# either a manifest written with --manifest or a wiktionary tsv file from a previous extraction
+	if dataIO.is_parquet(input_file): df = dataIO.read_table(input_file)
+	else: df = pd.read_csv(input_file, sep='\t', dtype=str, keep_default_na=False)
+	if 'hash' in df.columns:
+		return dict(zip(df['sense_id'], df['hash']))
+	return sense_hashes(df)
+
+
+def write_manifest(hashes, output_file):
+	pd.DataFrame({'sense_id': list(hashes), 'hash': list(hashes.values())}).to_csv(output_file, sep='\t', index=False)
+
+
+def write_delta(previous_hashes, hashes, output_file):
+	delta = {'sense_id': [], 'status': []}
+	for sense_id, sense_hash in hashes.items():
+		previous_hash = previous_hashes.get(sense_id)
+		if previous_hash is None: status = 'added'
+		elif previous_hash != sense_hash: status = 'changed'
+		else: continue
+		delta['sense_id'].append(sense_id)
+		delta['status'].append(status)
+	for sense_id in previous_hashes:
+		if sense_id not in hashes:
+			delta['sense_id'].append(sense_id)
+			delta['status'].append('removed')
+	
+	delta_df = pd.DataFrame(delta)
+	delta_df.to_csv(output_file, sep='\t', index=False)
+	
+	counts = delta_df['status'].value_counts()
+	print(f"Delta with the previous extraction: {counts.get('added', 0)} added, {counts.get('changed', 0)} changed, {counts.get('removed', 0)} removed senses.")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Extract Wiktionary data from a TTL dump file.")
-    parser.add_argument('--input', required=True, help='Path to the input TTL dump file.')
-    parser.add_argument('--output', required=True, help='Path to the output TSV file.')
+    parser.add_argument('--input', required=True, help='Path to the input TTL dump file, either plain or compressed (.bz2, .gz, .zst).')
+    parser.add_argument('--output', required=True, help='Path to the output TSV file (or parquet file if it ends with .parquet).')
+    parser.add_argument('--workers', type=int, default=1, help='Number of worker processes used to parse the dump (default: 1, sequential).')
+    parser.add_argument('--selective', action='store_true', help='Two-pass extraction that only keeps the noun and proper noun entries with their pages, senses and forms in memory.')
+    parser.add_argument('--store', help='Path to a SQLite file used to hold the extracted pages, entries, senses and forms on disk instead of in memory.')
+    parser.add_argument('--intern', action='store_true', help='Hold the extracted data in memory with integer ids backed by one string table and array-backed relations, to reduce the memory used by the extraction (not with --store).')
+    parser.add_argument('--previous', help='Path to the wiktionary TSV file or to the manifest of a previous extraction, to compute the senses added, removed and changed since then.')
+    parser.add_argument('--delta', help='Path to the output TSV file of added, removed and changed sense ids (default: <output>_delta.tsv, only written with --previous).')
+    parser.add_argument('--manifest', help='Path to an output TSV file with the content hash of each extracted sense.')
     args = parser.parse_args()
 
-    wiktionary_data = extract_wiki_data(args.input)
+    wiktionary_data = extract_wiki_data(args.input, workers=args.workers, selective=args.selective, store=args.store, intern=args.intern)
+    
+    df = data2df(wiktionary_data, args.output)
     
-    data2df(wiktionary_data, args.output)
+    if args.previous or args.manifest:
+        hashes = sense_hashes(df)
+        if args.manifest:
+            write_manifest(hashes, args.manifest)
+        if args.previous:
+            delta_file = args.delta or os.path.splitext(args.output)[0] + '_delta.tsv'
+            write_delta(read_sense_hashes(args.previous), hashes, delta_file)
 
 if __name__ == "__main__":
     main()
@@ -2,6 +2,7 @@ import pandas as pd
 import argparse
 import torch
 import dataEncoder as data
+import dataIO
 import lexicalClf as clf
 from transformers import AutoModel, AutoTokenizer, AutoConfig
 
@@ -10,11 +11,12 @@ from transformers import AutoModel, AutoTokenizer, AutoConfig
 if __name__ == "__main__":
 
 	parser = argparse.ArgumentParser(description="Predicts the most likely supersense and each supersense scores for each sense of the input Wiktionary resource.")
-	parser.add_argument('--input_wiktionary', required=True, help='Path to the input TSV file containing Wiktionary sense data.')
-	parser.add_argument('--input_examples', required=True, help='Path to the input TSV file containing Wiktionary example data for each sense.')
+	parser.add_argument('--input_wiktionary', required=True, help='Path to the input TSV (or parquet) file containing Wiktionary sense data.')
+	parser.add_argument('--input_examples', required=True, help='Path to the input TSV (or parquet) file containing Wiktionary example data for each sense.')
 	parser.add_argument('--output', required=True, help='Path to the output folder to save produced files.')
 	parser.add_argument('--model_dir', required=True, help='Path to the folder where the saved parameters of the trained classifiers are stored.')
 	parser.add_argument('--device_id', required=True, help='ID of the GPU or CPU used for the computation of the models calculations.')
+	parser.add_argument('--word_cache', help='Path to a json file keeping the subword ids of the words of the examples between runs with the same tokenizer.')
 
 	args = parser.parse_args()
 	
@@ -38,6 +40,7 @@ if __name__ == "__main__":
 	
 	MODEL_NAME = "flaubert/flaubert_large_cased"
 	tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+	word_cache = data.shared_word_cache(tokenizer, args.word_cache)
 	
 	def_lem_clf_file = args.model_dir + "/def_lem_clf.params"
 	ex_clf_file = args.model_dir + "/ex_clf.params"
@@ -56,5 +59,8 @@ if __name__ == "__main__":
 	
 	wiktionary_predictions = lex_clf.predict_wiki(wiki_encoder)
 	
+	print(f"Word cache: {word_cache.hits} words found, {word_cache.misses} words encoded ({100 * word_cache.hit_rate():.1f}% found).")
+	if args.word_cache: word_cache.save()
+	
 	wiki_df = pd.DataFrame(wiktionary_predictions)
-	wiki_df.to_csv(wiki_pred_file, sep='\t', index=False, encoding='utf-8')
+	dataIO.write_table(wiki_df, wiki_pred_file)
@@ -69,9 +69,9 @@ class monoRankClf(nn.Module):
 		self.tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
 		
 
-	def forward(self, padded_encodings):
+	def forward(self, padded_encodings, attention_mask=None):
 
-		bert_output = self.bert_model(padded_encodings, return_dict=True) # SHAPE [len(definitions), max_length, embedding_size]
+		bert_output = self.bert_model(padded_encodings, attention_mask=attention_mask, return_dict=True) # SHAPE [len(definitions), max_length, embedding_size]
 
 		batch_contextual_embeddings = bert_output.last_hidden_state[:,0,:] # from [batch_size , max_seq_length, plm_emb_size] to [batch_size, plm_emb_size]
 		
@@ -123,14 +123,14 @@ class monoRankClf(nn.Module):
 			rand_dev_epoch_accuracy = 0
 			
 			self.train()
-			for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, _, _ in train_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=True):
+			for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, _, _, b_attention_masks_with_lemma, b_attention_masks_without_lemma in train_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=True, dynamic_padding=params.get('dynamic_padding', False)):
 				
-				if use_lemma: b_def_encoded = b_definitions_with_lemma_encoded
-				else: b_def_encoded = b_definitions_without_lemma_encoded
+				if use_lemma: b_def_encoded, b_attention_masks = b_definitions_with_lemma_encoded, b_attention_masks_with_lemma
+				else: b_def_encoded, b_attention_masks = b_definitions_without_lemma_encoded, b_attention_masks_without_lemma
 				
 				self.zero_grad()
 				
-				log_probs = self.forward(b_def_encoded)
+				log_probs = self.forward(b_def_encoded, b_attention_masks)
 				
 				loss = loss_function(log_probs, b_supersenses_encoded)
 				loss.backward()
@@ -143,12 +143,12 @@ class monoRankClf(nn.Module):
 			self.eval()
 			with torch.no_grad():
 			
-				for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, _, _ in freq_dev_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=False):
+				for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, _, _, b_attention_masks_with_lemma, b_attention_masks_without_lemma in freq_dev_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=False, dynamic_padding=params.get('dynamic_padding', False)):
 					
-					if use_lemma: b_def_encoded = b_definitions_with_lemma_encoded
-					else: b_def_encoded = b_definitions_without_lemma_encoded
+					if use_lemma: b_def_encoded, b_attention_masks = b_definitions_with_lemma_encoded, b_attention_masks_with_lemma
+					else: b_def_encoded, b_attention_masks = b_definitions_without_lemma_encoded, b_attention_masks_without_lemma
 					
-					freq_dev_log_probs = self.forward(b_def_encoded)
+					freq_dev_log_probs = self.forward(b_def_encoded, b_attention_masks)
 
 					predicted_indices = torch.argmax(freq_dev_log_probs, dim=1)
 					freq_dev_epoch_accuracy += torch.sum((predicted_indices == b_supersenses_encoded).int()).item()
@@ -160,12 +160,12 @@ class monoRankClf(nn.Module):
 				freq_dev_accuracies.append(freq_dev_epoch_accuracy / freq_dev_encoder.length)
 				
 				
-				for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, _, _ in rand_dev_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=False):
+				for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, _, _, b_attention_masks_with_lemma, b_attention_masks_without_lemma in rand_dev_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=False, dynamic_padding=params.get('dynamic_padding', False)):
 					
-					if use_lemma: b_def_encoded = b_definitions_with_lemma_encoded
-					else: b_def_encoded = b_definitions_without_lemma_encoded
+					if use_lemma: b_def_encoded, b_attention_masks = b_definitions_with_lemma_encoded, b_attention_masks_with_lemma
+					else: b_def_encoded, b_attention_masks = b_definitions_without_lemma_encoded, b_attention_masks_without_lemma
 					
-					rand_dev_log_probs = self.forward(b_def_encoded)
+					rand_dev_log_probs = self.forward(b_def_encoded, b_attention_masks)
 
 					predicted_indices = torch.argmax(rand_dev_log_probs, dim=1)
 					rand_dev_epoch_accuracy += torch.sum((predicted_indices == b_supersenses_encoded).int()).item()
@@ -209,12 +209,12 @@ class monoRankClf(nn.Module):
 		self.eval()
 		accuracy = 0
 		with torch.no_grad():
-			for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, _, _ in data_encoder.make_batches(device=self.device, batch_size=self.params['batch_size'], shuffle_data=False):
+			for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, _, _, b_attention_masks_with_lemma, b_attention_masks_without_lemma in data_encoder.make_batches(device=self.device, batch_size=self.params['batch_size'], shuffle_data=False, dynamic_padding=self.params.get('dynamic_padding', False)):
 				
-				if self.use_lemma: b_def_encoded = b_definitions_with_lemma_encoded
-				else: b_def_encoded = b_definitions_without_lemma_encoded
+				if self.use_lemma: b_def_encoded, b_attention_masks = b_definitions_with_lemma_encoded, b_attention_masks_with_lemma
+				else: b_def_encoded, b_attention_masks = b_definitions_without_lemma_encoded, b_attention_masks_without_lemma
 				
-				log_probs = self.forward(b_def_encoded)
+				log_probs = self.forward(b_def_encoded, b_attention_masks)
 				predicted_indices = torch.argmax(log_probs, dim=1)
 				accuracy += torch.sum((predicted_indices == b_supersenses_encoded).int()).item()
 				
@@ -225,12 +225,12 @@ class monoRankClf(nn.Module):
 		self.eval()
 		predictions = {"lemma":[], "sense_id":[], "gold":[], "pred":[], "definition":[]}
 		with torch.no_grad():
-			for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, b_senses_ids, b_lemmas in data_encoder.make_batches(device=self.device, batch_size=self.params['batch_size'], shuffle_data=False):
+			for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, b_senses_ids, b_lemmas, b_attention_masks_with_lemma, b_attention_masks_without_lemma in data_encoder.make_batches(device=self.device, batch_size=self.params['batch_size'], shuffle_data=False, dynamic_padding=self.params.get('dynamic_padding', False)):
 				
-				if self.use_lemma: b_def_encoded = b_definitions_with_lemma_encoded
-				else: b_def_encoded = b_definitions_without_lemma_encoded
+				if self.use_lemma: b_def_encoded, b_attention_masks = b_definitions_with_lemma_encoded, b_attention_masks_with_lemma
+				else: b_def_encoded, b_attention_masks = b_definitions_without_lemma_encoded, b_attention_masks_without_lemma
 				
-				log_probs = self.forward(b_def_encoded)
+				log_probs = self.forward(b_def_encoded, b_attention_masks)
 				predicted_indices = torch.argmax(log_probs, dim=1).tolist()
 				
 				pred = [SUPERSENSES[i] for i in predicted_indices]
@@ -286,13 +286,13 @@ class multiRankClf(nn.Module):
 		
 		self.device = DEVICE
 
-	def forward(self, X_input, X_rank):
+	def forward(self, X_input, X_rank, attention_mask=None):
 	
 		batch_size = self.params['batch_size']
 		max_length = self.params['max_seq_length']
 		bert_emb_size = self.embedding_layer_size
 
-		bert_tok_embeddings = self.bert_model(input_ids=X_input).last_hidden_state # [batch_size, max_length, bert_emb_size]
+		bert_tok_embeddings = self.bert_model(input_ids=X_input, attention_mask=attention_mask).last_hidden_state # [batch_size, max_length, bert_emb_size]
 
 		selected_tensors = [bert_tok_embeddings[idx, X_rank[idx], :] for idx in range(bert_tok_embeddings.size(0))]
 
@@ -344,11 +344,11 @@ class multiRankClf(nn.Module):
 			rand_dev_epoch_accuracy = 0
 			
 			self.train()
-			for b_bert_encodings, b_target_ranks, b_supersenses_encoded, _, _ in train_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=True):
+			for b_bert_encodings, b_target_ranks, b_supersenses_encoded, _, _, b_attention_masks in train_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=True, dynamic_padding=params.get('dynamic_padding', False)):
 				
 				self.zero_grad()
 				
-				log_probs = self.forward(b_bert_encodings, b_target_ranks)
+				log_probs = self.forward(b_bert_encodings, b_target_ranks, b_attention_masks)
 				
 				loss = loss_function(log_probs, b_supersenses_encoded)
 				loss.backward()
@@ -361,9 +361,9 @@ class multiRankClf(nn.Module):
 			self.eval()
 			with torch.no_grad():
 			
-				for b_bert_encodings, b_target_ranks, b_supersenses_encoded, _, _ in freq_dev_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=False):
+				for b_bert_encodings, b_target_ranks, b_supersenses_encoded, _, _, b_attention_masks in freq_dev_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=False, dynamic_padding=params.get('dynamic_padding', False)):
 					
-					freq_dev_log_probs = self.forward(b_bert_encodings, b_target_ranks)
+					freq_dev_log_probs = self.forward(b_bert_encodings, b_target_ranks, b_attention_masks)
 
 					predicted_indices = torch.argmax(freq_dev_log_probs, dim=1)
 					freq_dev_epoch_accuracy += torch.sum((predicted_indices == b_supersenses_encoded).int()).item()
@@ -375,9 +375,9 @@ class multiRankClf(nn.Module):
 				freq_dev_accuracies.append(freq_dev_epoch_accuracy / freq_dev_encoder.length)
 				
 				
-				for b_bert_encodings, b_target_ranks, b_supersenses_encoded, _, _ in rand_dev_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=False):
+				for b_bert_encodings, b_target_ranks, b_supersenses_encoded, _, _, b_attention_masks in rand_dev_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=False, dynamic_padding=params.get('dynamic_padding', False)):
 					
-					rand_dev_log_probs = self.forward(b_bert_encodings, b_target_ranks)
+					rand_dev_log_probs = self.forward(b_bert_encodings, b_target_ranks, b_attention_masks)
 
 					predicted_indices = torch.argmax(rand_dev_log_probs, dim=1)
 					rand_dev_epoch_accuracy += torch.sum((predicted_indices == b_supersenses_encoded).int()).item()
@@ -437,11 +437,11 @@ class multiRankClf(nn.Module):
 			dev_epoch_loss = 0
 			dev_epoch_accuracy = 0
 			
-			for b_bert_encodings, b_target_ranks, b_supersenses_encoded, _, _ in train_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=True):
+			for b_bert_encodings, b_target_ranks, b_supersenses_encoded, _, _, b_attention_masks in train_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=True, dynamic_padding=params.get('dynamic_padding', False)):
 				
 				self.zero_grad()
 				
-				log_probs = self.forward(b_bert_encodings, b_target_ranks)
+				log_probs = self.forward(b_bert_encodings, b_target_ranks, b_attention_masks)
 				
 				loss = loss_function(log_probs, b_supersenses_encoded)
 				loss.backward()
@@ -453,9 +453,9 @@ class multiRankClf(nn.Module):
 			
 			with torch.no_grad():
 			
-				for b_bert_encodings, b_target_ranks, b_supersenses_encoded, _, _ in dev_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=False):
+				for b_bert_encodings, b_target_ranks, b_supersenses_encoded, _, _, b_attention_masks in dev_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=False, dynamic_padding=params.get('dynamic_padding', False)):
 					
-					dev_log_probs = self.forward(b_bert_encodings, b_target_ranks)
+					dev_log_probs = self.forward(b_bert_encodings, b_target_ranks, b_attention_masks)
 
 					predicted_indices = torch.argmax(dev_log_probs, dim=1)
 					dev_epoch_accuracy += torch.sum((predicted_indices == b_supersenses_encoded).int()).item()
@@ -497,9 +497,9 @@ class multiRankClf(nn.Module):
 		self.eval()
 		accuracy = 0
 		with torch.no_grad():
-			for b_bert_encodings, b_target_ranks, b_supersenses_encoded, _, _ in data_encoder.make_batches(device=self.device, batch_size=self.params['batch_size'], shuffle_data=False):
+			for b_bert_encodings, b_target_ranks, b_supersenses_encoded, _, _, b_attention_masks in data_encoder.make_batches(device=self.device, batch_size=self.params['batch_size'], shuffle_data=False, dynamic_padding=self.params.get('dynamic_padding', False)):
 				
-				log_probs = self.forward(b_bert_encodings, b_target_ranks)
+				log_probs = self.forward(b_bert_encodings, b_target_ranks, b_attention_masks)
 				predicted_indices = torch.argmax(log_probs, dim=1)
 				accuracy += torch.sum((predicted_indices == b_supersenses_encoded).int()).item()
 				
@@ -510,9 +510,9 @@ class multiRankClf(nn.Module):
 		self.eval()
 		predictions = {"lemma":[], "sense_id":[], "gold":[], "pred":[], "sentence":[]}
 		with torch.no_grad():
-			for b_bert_encodings, b_target_ranks, b_supersenses_encoded, b_senses_ids, b_lemmas in data_encoder.make_batches(device=self.device, batch_size=self.params['batch_size'], shuffle_data=False):
+			for b_bert_encodings, b_target_ranks, b_supersenses_encoded, b_senses_ids, b_lemmas, b_attention_masks in data_encoder.make_batches(device=self.device, batch_size=self.params['batch_size'], shuffle_data=False, dynamic_padding=self.params.get('dynamic_padding', False)):
 				
-				log_probs = self.forward(b_bert_encodings, b_target_ranks)
+				log_probs = self.forward(b_bert_encodings, b_target_ranks, b_attention_masks)
 				predicted_indices = torch.argmax(log_probs, dim=1).tolist()
 				
 				pred = [SUPERSENSES[i] for i in predicted_indices]
@@ -559,9 +559,9 @@ class multiRankClf(nn.Module):
 		self.eval()
 		predictions = {"lemma":[], "sense_id":[], "gold":[], "pred":[], "sentence":[]}
 		with torch.no_grad():
-			for b_bert_encodings, b_target_ranks, b_supersenses_encoded, b_senses_ids, b_lemmas in data_encoder.make_batches(device=self.device, batch_size=self.params['batch_size'], shuffle_data=False):
+			for b_bert_encodings, b_target_ranks, b_supersenses_encoded, b_senses_ids, b_lemmas, b_attention_masks in data_encoder.make_batches(device=self.device, batch_size=self.params['batch_size'], shuffle_data=False, dynamic_padding=self.params.get('dynamic_padding', False)):
 				
-				log_probs = self.forward(b_bert_encodings, b_target_ranks)
+				log_probs = self.forward(b_bert_encodings, b_target_ranks, b_attention_masks)
 				predicted_indices = torch.argmax(log_probs, dim=1).tolist()
 				
 				pred = [SUPERSENSES[i] for i in predicted_indices]
@@ -905,9 +905,9 @@ class KANmonoRankClf(nn.Module):
 		
 		
 
-	def forward(self, padded_encodings):
+	def forward(self, padded_encodings, attention_mask=None):
 
-		bert_output = self.bert_model(padded_encodings, return_dict=True) # SHAPE [len(definitions), max_length, embedding_size]
+		bert_output = self.bert_model(padded_encodings, attention_mask=attention_mask, return_dict=True) # SHAPE [len(definitions), max_length, embedding_size]
 
 		batch_contextual_embeddings = bert_output.last_hidden_state[:,0,:] # from [batch_size , max_seq_length, plm_emb_size] to [batch_size, plm_emb_size]
 		
@@ -957,14 +957,14 @@ class KANmonoRankClf(nn.Module):
 			rand_dev_epoch_accuracy = 0
 			
 			self.train()
-			for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, _, _ in train_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=True):
+			for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, _, _, b_attention_masks_with_lemma, b_attention_masks_without_lemma in train_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=True, dynamic_padding=params.get('dynamic_padding', False)):
 				
-				if use_lemma: b_def_encoded = b_definitions_with_lemma_encoded
-				else: b_def_encoded = b_definitions_without_lemma_encoded
+				if use_lemma: b_def_encoded, b_attention_masks = b_definitions_with_lemma_encoded, b_attention_masks_with_lemma
+				else: b_def_encoded, b_attention_masks = b_definitions_without_lemma_encoded, b_attention_masks_without_lemma
 				
 				optimizer.zero_grad()
 				
-				log_probs = self.forward(b_def_encoded)
+				log_probs = self.forward(b_def_encoded, b_attention_masks)
 				
 				loss = loss_function(log_probs, b_supersenses_encoded)
 				loss.backward()
@@ -976,12 +976,12 @@ class KANmonoRankClf(nn.Module):
 			
 			with torch.no_grad():
 				self.eval()
-				for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, _, _ in freq_dev_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=False):
+				for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, _, _, b_attention_masks_with_lemma, b_attention_masks_without_lemma in freq_dev_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=False, dynamic_padding=params.get('dynamic_padding', False)):
 					
-					if use_lemma: b_def_encoded = b_definitions_with_lemma_encoded
-					else: b_def_encoded = b_definitions_without_lemma_encoded
+					if use_lemma: b_def_encoded, b_attention_masks = b_definitions_with_lemma_encoded, b_attention_masks_with_lemma
+					else: b_def_encoded, b_attention_masks = b_definitions_without_lemma_encoded, b_attention_masks_without_lemma
 					
-					freq_dev_log_probs = self.forward(b_def_encoded)
+					freq_dev_log_probs = self.forward(b_def_encoded, b_attention_masks)
 
 					predicted_indices = torch.argmax(freq_dev_log_probs, dim=1)
 					freq_dev_epoch_accuracy += torch.sum((predicted_indices == b_supersenses_encoded).int()).item()
@@ -993,12 +993,12 @@ class KANmonoRankClf(nn.Module):
 				freq_dev_accuracies.append(freq_dev_epoch_accuracy / freq_dev_encoder.length)
 				
 				self.eval()
-				for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, _, _ in rand_dev_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=False):
+				for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, _, _, b_attention_masks_with_lemma, b_attention_masks_without_lemma in rand_dev_encoder.make_batches(device=self.device, batch_size=params['batch_size'], shuffle_data=False, dynamic_padding=params.get('dynamic_padding', False)):
 					
-					if use_lemma: b_def_encoded = b_definitions_with_lemma_encoded
-					else: b_def_encoded = b_definitions_without_lemma_encoded
+					if use_lemma: b_def_encoded, b_attention_masks = b_definitions_with_lemma_encoded, b_attention_masks_with_lemma
+					else: b_def_encoded, b_attention_masks = b_definitions_without_lemma_encoded, b_attention_masks_without_lemma
 					
-					rand_dev_log_probs = self.forward(b_def_encoded)
+					rand_dev_log_probs = self.forward(b_def_encoded, b_attention_masks)
 
 					predicted_indices = torch.argmax(rand_dev_log_probs, dim=1)
 					rand_dev_epoch_accuracy += torch.sum((predicted_indices == b_supersenses_encoded).int()).item()
@@ -1051,12 +1051,12 @@ class KANmonoRankClf(nn.Module):
 		self.eval()
 		accuracy = 0
 		with torch.no_grad():
-			for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, _, _ in data_encoder.make_batches(device=self.device, batch_size=self.params['batch_size'], shuffle_data=False):
+			for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, _, _, b_attention_masks_with_lemma, b_attention_masks_without_lemma in data_encoder.make_batches(device=self.device, batch_size=self.params['batch_size'], shuffle_data=False, dynamic_padding=self.params.get('dynamic_padding', False)):
 				
-				if self.use_lemma: b_def_encoded = b_definitions_with_lemma_encoded
-				else: b_def_encoded = b_definitions_without_lemma_encoded
+				if self.use_lemma: b_def_encoded, b_attention_masks = b_definitions_with_lemma_encoded, b_attention_masks_with_lemma
+				else: b_def_encoded, b_attention_masks = b_definitions_without_lemma_encoded, b_attention_masks_without_lemma
 				
-				log_probs = self.forward(b_def_encoded)
+				log_probs = self.forward(b_def_encoded, b_attention_masks)
 				predicted_indices = torch.argmax(log_probs, dim=1)
 				accuracy += torch.sum((predicted_indices == b_supersenses_encoded).int()).item()
 				
@@ -1067,12 +1067,12 @@ class KANmonoRankClf(nn.Module):
 		self.eval()
 		predictions = {"lemma":[], "sense_id":[], "gold":[], "pred":[], "definition":[]}
 		with torch.no_grad():
-			for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, b_senses_ids, b_lemmas in data_encoder.make_batches(device=self.device, batch_size=self.params['batch_size'], shuffle_data=False):
+			for b_definitions_with_lemma_encoded, b_definitions_without_lemma_encoded, b_supersenses_encoded, b_senses_ids, b_lemmas, b_attention_masks_with_lemma, b_attention_masks_without_lemma in data_encoder.make_batches(device=self.device, batch_size=self.params['batch_size'], shuffle_data=False, dynamic_padding=self.params.get('dynamic_padding', False)):
 				
-				if self.use_lemma: b_def_encoded = b_definitions_with_lemma_encoded
-				else: b_def_encoded = b_definitions_without_lemma_encoded
+				if self.use_lemma: b_def_encoded, b_attention_masks = b_definitions_with_lemma_encoded, b_attention_masks_with_lemma
+				else: b_def_encoded, b_attention_masks = b_definitions_without_lemma_encoded, b_attention_masks_without_lemma
 				
-				log_probs = self.forward(b_def_encoded)
+				log_probs = self.forward(b_def_encoded, b_attention_masks)
 				predicted_indices = torch.argmax(log_probs, dim=1).tolist()
 				
 				pred = [SUPERSENSES[i] for i in predicted_indices]
@@ -1,166 +1,436 @@
 import spacy
 import pandas as pd
 import argparse
+import dataIO
+import sqlite3
+import hashlib
+import json
+import os
+import re
+import random
+import time
 from collections import Counter, defaultdict
+from functools import lru_cache
 from random import shuffle
 import numpy as np
 from matplotlib import pyplot as plt
+from spacy.attrs import ORTH
 
 
 # compound words link token
 sp_sym = '##'
 
+SPACY_MODEL = "fr_core_news_lg"
 
-def data_analysis(input_file):
-	df_senses = pd.read_csv(input_file, sep='\t')
-	
-	examples = []
-	for i in range(1, 24):
-		examples.append(df_senses[(df_senses[f'example_{i}'] != "") & (df_senses[f'example_{i}'].notna())][f'example_{i}'].tolist())
-	examples_ = [item for sublist in examples for item in sublist]
-	
-	lemmas = []
-	for i in range(1, 24):
-		lemmas.append(df_senses[(df_senses[f'example_{i}'] != "") & (df_senses[f'example_{i}'].notna())]['lemma'].tolist())
-	lemmas_ = [item for sublist in lemmas for item in sublist]
-	
-	sense_ids = []
-	for i in range(1, 24):
-		sense_ids.append(df_senses[(df_senses[f'example_{i}'] != "") & (df_senses[f'example_{i}'].notna())]['sense_id'].tolist())
-	sense_ids_ = [item for sublist in sense_ids for item in sublist]
+# the target word is first looked for in the tokens given by the tokenizer of the model alone, without its components and word vectors;
+# the examples where it is not found go through the components needed for the lemmas (the word vectors are kept, tok2vec uses them).
+# The parser, senter and ner are never loaded.
+LEMMA_EXCLUDE = ["parser", "senter", "ner"]
+TOKENIZER_EXCLUDE = ["tok2vec", "tagger", "morphologizer", "attribute_ruler", "lemmatizer", "vectors"] + LEMMA_EXCLUDE
 
-	nums = []
-	for i in range(1, 24):
-		nums.append([f"{i}"]*len(sense_ids[i-1]))
-	nums_ = [item for sublist in nums for item in sublist]
+# version of the processing of an example, part of the cache keys: to be changed when the processing changes
+CACHE_VERSION = 2
+# number of results written at once to the cache
+CACHE_BATCH_SIZE = 10000
+# number of lemmas whose matcher is kept
+LEMMA_MATCHERS_SIZE = 50000
 
-	print('number of examples:', len(examples_))
+OUTPUT_COLUMNS = ['sense_id', 'lemma', 'num_ex', 'word_rank', 'example']
 
-	return examples_, lemmas_, sense_ids_, nums_
+# chunks (text between two spaces) split by the fast tokenizer: opening punctuation, a word of latin letters possibly elided (l'homme),
+# a period and closing punctuation; or punctuation marks
+FAST_LETTERS = 'A-Za-zÀ-ÖØ-öø-ɏ'
+FAST_OPENING = '«(\\[\\"“'
+FAST_CLOSING = ',;:!?)\\]»\\"”…'
+fast_chunk_re = re.compile(rf"([{FAST_OPENING}]*)([{FAST_LETTERS}]+)(?:(['’])([{FAST_LETTERS}]+))?(\.?)([{FAST_CLOSING}]*)")
+fast_punct_re = re.compile(rf"[{FAST_OPENING}{FAST_CLOSING}]+\.?|\.|[–-]")
+fast_word_re = re.compile(rf"[{FAST_LETTERS}]+(?:['’][{FAST_LETTERS}]+)?\.?")
+# number of chunks whose tokens are kept by the fast tokenizer, the kept chunks are cleared when it is reached
+FAST_CHUNKS_SIZE = 200000
 
 
+def data_analysis(input_file):
+	df_senses = dataIO.read_table(input_file, columns=['lemma', 'sense_id'] + dataIO.EXAMPLE_COLUMNS)
+	
+	df_examples = melt_examples(df_senses)
 
-def compound_lemma(lemma, sentence, special_token=sp_sym):
-	lemma = str(lemma)
+	print('number of examples:', len(df_examples))
 
-	lemma_words = lemma.split()
+	return df_examples
 
-	compound_lemma = special_token.join(lemma_words).replace("'", f"'{sp_sym}")
 
-	result_sentence = sentence.replace(' '.join(lemma_words), compound_lemma)
+def melt_examples(df_senses, example_columns=dataIO.EXAMPLE_COLUMNS):
+	# one row (sense_id, lemma, num, example) per non empty example, all first examples first, then all second examples, ...
+	df_examples = df_senses.melt(id_vars=['sense_id', 'lemma'], value_vars=example_columns, var_name='num', value_name='example')
+	df_examples = df_examples[df_examples['example'].notna() & (df_examples['example'] != "")]
+	df_examples['num'] = df_examples['num'].str.replace('example_', '', regex=False)
+	return df_examples.reset_index(drop=True)
 
-	return result_sentence
 
-def lemmatize_spacy(text, lemma):
-	lemma = str(lemma)
-	doc = nlp(str(text))
-	lemmatized_words = [token.lemma_ for token in doc]
-	lemmatized_text = ' '.join(lemmatized_words).replace(' - ', '-')
-	for punc in [',', ';', ':', '.', '!', '?']: 
-		lemmatized_text = lemmatized_text.replace(f'{punc}-', f'{punc} -')
-		lemmatized_text = lemmatized_text.replace(f'{punc}–', f'{punc} –')
 
-	if '_' in lemma or ' ' in lemma:
-		if lemma.replace('_', ' ').replace("'", "' ") in lemmatized_text:
-			lemmatized_text = compound_lemma(lemma.replace('_', ' '), lemmatized_text, sp_sym)
-			
-	lemmatized_words = lemmatized_text.split()
-	# lemmatized_words = [tok.replace(sp_sym, ' ') for tok in lemmatized_words]
-	return lemmatized_words
-
-def tokenize_spacy(text, lemma):
-	lemma = str(lemma)
-	doc = nlp(str(text))
-	tokens = [token.text for token in doc]
-	tokenized_text = ' '.join(tokens).replace(' - ', '-')
+def join_words(words):
+	# tokens or lemmas of a doc joined as in the tokenized example: hyphens are attached back to their words
+	text = ' '.join(words).replace(' - ', '-')
 	for punc in [',', ';', ':', '.', '!', '?']: 
-		tokenized_text = tokenized_text.replace(f'{punc}-', f'{punc} -')
-		tokenized_text = tokenized_text.replace(f'{punc}–', f'{punc} –')
-		
-	if '_' in lemma or ' ' in lemma:
-		if lemma.replace('_', ' ').replace("'", "' ") in tokenized_text:
-			tokenized_text = compound_lemma(lemma.replace('_', ' '), tokenized_text, sp_sym)
-			
-	tokens = tokenized_text.split()
-	# tokens = [tok.replace(sp_sym, ' ') for tok in tokens]
-	return tokens 
+		text = text.replace(f'{punc}-', f'{punc} -')
+		text = text.replace(f'{punc}–', f'{punc} –')
+	return text.split()
 
+def lemmatize_doc(doc):
+	return join_words([token.lemma_ for token in doc])
 
-def examples_iterator(*example_lists):
-	for examples in example_lists:
-	        for example in examples:
-	        	yield example
-            
-            
 
-def find_rank(lemma, tokenized_words):
-	lemma = str(lemma)
-	for i, word in enumerate(tokenized_words):
-		if (word == lemma) or (word.lower() == lemma.lower()): return i
-	return -1
 
-if __name__ == "__main__":
+@lru_cache(maxsize=LEMMA_MATCHERS_SIZE)
+def lemma_matcher(lemma):
+	# the lowercased word sequences of a lemma, longest first, by their first word: the words of a multi-word lemma
+	# (joined with _ or spaces), with or without the apostrophes split from the following word (d'œuvre or d' œuvre)
+	words = str(lemma).lower().replace('_', ' ').split()
+	split_words = ' '.join(words).replace("'", "' ").split()
+	
+	matcher = defaultdict(list)
+	for variant in sorted({tuple(words), tuple(split_words)}, key=len, reverse=True):
+		if variant: matcher[variant[0]].append(variant)
+	return dict(matcher)
+
+def match_lemma(words, lemma):
+	# each occurrence of the lemma in the words, whatever the case, is merged into one word joined with sp_sym (pomme##de##terre, chef##d'##œuvre);
+	# returns the merged words and the rank of the first occurrence among them, -1 if the lemma does not occur
+	matcher = lemma_matcher(lemma)
+	lower_words = [word.lower() for word in words]
+	merged_words = []
+	rank = -1
+	
+	i = 0
+	while i < len(words):
+		length = 0
+		for variant in matcher.get(lower_words[i], ()):
+			if tuple(lower_words[i:i+len(variant)]) == variant:
+				length = len(variant)
+				break
+		
+		if length:
+			if rank == -1: rank = len(merged_words)
+			merged_words.append(sp_sym.join(words[i:i+length]))
+			i += length
+		else:
+			merged_words.append(words[i])
+			i += 1
+	
+	return merged_words, rank
 
-	parser = argparse.ArgumentParser(description="Process wiktionary examples from a TSV file and outputs the resultings processed examples in a TSV file with the tokenized examples and the target word ranks.")
-	parser.add_argument('--input', required=True, help='Path to the input TSV file.')
-	parser.add_argument('--output', required=True, help='Path to the output TSV file.')
 
-	args = parser.parse_args()
+class exampleCache:
+	# word rank and tokenized example of the examples already processed, in a SQLite file.
+	# Results are keyed by a hash of the example, the lemma and the spaCy model (name and version), they do not depend on the sense.
 	
+	def __init__(self, path, model):
+		self.connection = sqlite3.connect(path)
+		self.connection.execute("CREATE TABLE IF NOT EXISTS examples (key TEXT PRIMARY KEY, word_rank INTEGER, example TEXT)")
+		self.model = f"{model}\x1f{CACHE_VERSION}"
+		self.pending = []
+		self.hits = 0
+		self.misses = 0
 	
-	print('WIKTIONARY EXAMPLES EXTRACTION...')	
-	examples_, lemmas_, sense_ids_, nums_ = data_analysis(args.input)
-	print('WIKTIONARY EXAMPLES EXTRACTED.')
-	print()
+	def key(self, example, lemma):
+		return hashlib.sha1(f"{example}\x1f{lemma}\x1f{self.model}".encode('utf-8')).hexdigest()
+	
+	def get(self, example, lemma):
+		row = self.connection.execute("SELECT word_rank, example FROM examples WHERE key = ?", (self.key(example, lemma),)).fetchone()
+		if row is None: self.misses += 1
+		else: self.hits += 1
+		return row
 	
-	example_iter = examples_iterator(
-		examples_
-	)
+	def put(self, example, lemma, word_rank, tokenized_example):
+		self.pending.append((self.key(example, lemma), word_rank, tokenized_example))
+		if len(self.pending) >= CACHE_BATCH_SIZE: self.flush()
+	
+	def flush(self):
+		self.connection.executemany("INSERT OR REPLACE INTO examples (key, word_rank, example) VALUES (?, ?, ?)", self.pending)
+		self.connection.commit()
+		self.pending = []
 
-	lemma_iter = examples_iterator(
-		lemmas_
-	)
 
-	sense_id_iter = examples_iterator(
-		sense_ids_
-	)
+def model_name(nlp):
+	return f"{nlp.meta['lang']}_{nlp.meta['name']}-{nlp.meta['version']}"
 
-	num_iter = examples_iterator(
-		nums_
-	)
 
+def example_rows(examples, examples_data, cache=None):
+	# appends the row of each (sense_id, lemma, num, example) to examples_data, with the result of the cache if there is one,
+	# and yields the text and the index of the row of the examples to process
+	for sense_id, lemma, num, example in examples:
+		example = str(example)
+		example_data = {'sense_id': sense_id, 'lemma': lemma, 'num_ex': num, 'word_rank': -1, 'example': None}
+		examples_data.append(example_data)
+		
+		cached = cache.get(example, lemma) if cache is not None else None
+		if cached is not None: example_data['word_rank'], example_data['example'] = cached
+		else: yield example, len(examples_data) - 1
 
 
-	print("LOADING SPACY fr_core_news_lg...")
-	nlp = spacy.load("fr_core_news_lg")
-	print("LOADED SPACY fr_core_news_lg.")
-	print()
+class fastTokenizer:
+	# tokenizes the examples as the spaCy tokenizer of the model, for the chunks whose tokens are known without it:
+	# its special cases are used as such, the other chunks are split on the rules of the french tokenizer for punctuation and elisions.
+	# Returns None for an example with another chunk (digits, hyphens, several apostrophes, emoticons, ...), to be tokenized by spaCy.
+	
+	def __init__(self, tokenizer):
+		self.specials = {chunk: [token[ORTH] for token in tokens] for chunk, tokens in tokenizer.rules.items()}
+		# special cases with punctuation other than a word with a period (:), (o:, J.-C., ...), the chunks that contain one are not split
+		self.punct_specials = [chunk for chunk in self.specials if len(chunk) > 1 and not fast_word_re.fullmatch(chunk)]
+		self.token_match = tokenizer.token_match
+		self.chunks = {}
+		self.hits = 0
+		self.misses = 0
+	
+	def split_affixes(self, affixes):
+		# punctuation split in characters, unless repeated (……)
+		if any(affixes[i] == affixes[i+1] for i in range(len(affixes)-1)): return None
+		return list(affixes)
+	
+	def split_chunk(self, chunk):
+		if chunk in self.specials: return self.specials[chunk]
+		if any(special in chunk for special in self.punct_specials): return None
+		if fast_punct_re.fullmatch(chunk): return self.split_affixes(chunk)
+		
+		match = fast_chunk_re.fullmatch(chunk)
+		if match is None: return None
+		prefix, word, apostrophe, rest, period, suffix = match.groups()
+		core = word + apostrophe + rest if apostrophe else word
+		last_word = rest if apostrophe else word
+		
+		if self.split_affixes(f"{prefix} {period}{suffix}") is None: return None
+		if period:
+			# abbreviations (M., etc.) are kept whole, and the period is split after a lowercase letter or two uppercase letters only
+			if core + '.' in self.specials or last_word + '.' in self.specials: return None
+			if not (last_word[-1].islower() or len(last_word) >= 2 and last_word[-2:].isupper()): return None
+		
+		# words kept whole (aujourd'hui, prud'homme)
+		if core in self.specials: core_tokens = self.specials[core]
+		elif apostrophe and self.token_match(core): return None
+		elif apostrophe: core_tokens = [word + apostrophe, rest]
+		else: core_tokens = [word]
+		
+		return list(prefix) + core_tokens + list(period + suffix)
+	
+	def __call__(self, text):
+		tokens = []
+		for chunk in text.split(' '):
+			if chunk not in self.chunks: 
+				if len(self.chunks) >= FAST_CHUNKS_SIZE: self.chunks.clear()
+				self.chunks[chunk] = self.split_chunk(chunk)
+			if self.chunks[chunk] is None:
+				self.misses += 1
+				return None
+			tokens += self.chunks[chunk]
+		self.hits += 1
+		return tokens
+
+
+def rank_tokens(example_data, tokens, text, i, fallback_examples, cache=None):
+	lemma = example_data['lemma']
+	# the target word is looked for in the tokens, where its occurrences are joined if it has several words
+	result_spacy, word_rank = match_lemma(join_words(tokens), lemma)
+	
+	example_data['example'] = ' '.join(result_spacy)
+	
+	if word_rank != -1: 
+		example_data['word_rank'] = word_rank
+		if cache is not None: cache.put(text, lemma, example_data['word_rank'], example_data['example'])
+	else: fallback_examples.append((text, i))
+
+
+def fast_rows(texts, fast_tokenizer, examples_data, fallback_examples, cache=None):
+	# the examples tokenized by the fast tokenizer are ranked here, the other ones are yielded to spaCy
+	for text, i in texts:
+		tokens = fast_tokenizer(text)
+		if tokens is None: yield text, i
+		else: rank_tokens(examples_data[i], tokens, text, i, fallback_examples, cache)
+
+
+def validate_fast_tokenizer(texts, fast_tokenizer, nlp):
+	# compares the tokens of the fast tokenizer with the tokens of spaCy on the texts
+	start = time.time()
+	fast_tokens = [fast_tokenizer(text) for text in texts]
+	fast_time = time.time() - start
+	start = time.time()
+	spacy_tokens = [[token.text for token in doc] for doc in nlp.pipe(texts)]
+	spacy_time = time.time() - start
+	
+	covered = [(text, fast, tokens) for text, fast, tokens in zip(texts, fast_tokens, spacy_tokens) if fast is not None]
+	differences = [(text, fast, tokens) for text, fast, tokens in covered if fast != tokens]
+	
+	print(f"Examples: {len(texts)}")
+	print(f"Tokenized by the fast tokenizer: {len(covered)} ({100 * len(covered) / max(len(texts), 1):.1f}%)")
+	print(f"Different from spaCy: {len(differences)}")
+	for text, fast, tokens in differences[:20]:
+		print(f"\t{text}\n\t\tfast:  {fast}\n\t\tspaCy: {tokens}")
+	print(f"Time: {fast_time:.2f}s for the fast tokenizer, {spacy_time:.2f}s for spaCy")
+	return len(differences)
+
 
-	lemmas_not_found = 0
+def lemma_nlp(models):
+	# the model with the components needed for the lemmas is only loaded when an example needs it
+	if models.get('lemma') is None: models['lemma'] = spacy.load(SPACY_MODEL, exclude=LEMMA_EXCLUDE)
+	return models['lemma']
 
+
+def find_ranks(examples, models, cache=None, batch_size=256, n_process=1):
+	# rows (sense_id, lemma, num_ex, word_rank, example) of the (sense_id, lemma, num, example) tuples, in the same order
 	examples_data = []
+	
+	# examples to lemmatize, with the index of their row in examples_data
+	fallback_examples = []
 
+	# examples are processed in batches by nlp.pipe, with the index of their row as context: rows stay in input order
+	texts = example_rows(examples, examples_data, cache)
+	if models.get('fast') is not None: texts = fast_rows(texts, models['fast'], examples_data, fallback_examples, cache)
+	
+	for doc, i in models['tokenizer'].pipe(texts, as_tuples=True, batch_size=batch_size):
+		rank_tokens(examples_data[i], [token.text for token in doc], doc.text, i, fallback_examples, cache)
+	
+	if fallback_examples:
+		print(f"LEMMATIZING {len(fallback_examples)} EXAMPLES WHERE THE TARGET WORD WAS NOT FOUND...")
+		
+		for doc, i in lemma_nlp(models).pipe(fallback_examples, as_tuples=True, batch_size=batch_size, n_process=n_process):
+			example_data = examples_data[i]
+			lemma = example_data['lemma']
+			# the lemmas come from one doc, with the same tokens as in the first pass
+			_, example_data['word_rank'] = match_lemma(lemmatize_doc(doc), lemma)
+			if cache is not None: cache.put(doc.text, lemma, example_data['word_rank'], example_data['example'])
+	
+	return examples_data
 
 
-	print("FINDING TARGET WORD RANK IN EXAMPLES...")
+def checkpoint_file(output_file):
+	return f"{output_file}.checkpoint"
 
-	for example, lemma, sense_id, num in zip(example_iter, lemma_iter, sense_id_iter, num_iter):
-		
-		result_spacy = tokenize_spacy(example, lemma)
-		result_spacy_lower = [tok.lower() for tok in result_spacy]
-		
-		example_data = {'sense_id': sense_id, 'lemma': lemma, 'num_ex': num, 'word_rank': -1, 'example': ' '.join(result_spacy)}
+
+def read_checkpoint(output_file):
+	if not os.path.exists(checkpoint_file(output_file)): return None
+	with open(checkpoint_file(output_file), encoding='utf-8') as f:
+		return json.load(f)
+
+
+def write_checkpoint(output_file, checkpoint):
+	# the checkpoint is replaced at once, a crash leaves either the previous one or the new one
+	with open(f"{checkpoint_file(output_file)}.tmp", 'w', encoding='utf-8') as f:
+		json.dump(checkpoint, f)
+		f.flush()
+		os.fsync(f.fileno())
+	os.replace(f"{checkpoint_file(output_file)}.tmp", checkpoint_file(output_file))
+
+
+def append_rows(examples_data, output, header):
+	output.write(pd.DataFrame(examples_data, columns=OUTPUT_COLUMNS).to_csv(sep='\t', index=False, header=header).encode('utf-8'))
+	output.flush()
+	os.fsync(output.fileno())
+	return output.tell()
+
+
+def stream_examples(args, models, cache=None):
+	# the senses are read chunk_size at a time, and the rows of the examples of each chunk are appended to the output
+	# before the checkpoint is updated with the number of senses and examples done and the size of the output.
+	# With resume, the output is cut back to the size of the checkpoint and the senses already done are skipped.
+	checkpoint = read_checkpoint(args.output) if args.resume else None
+	if checkpoint is not None:
+		if checkpoint['input'] != os.path.abspath(args.input) or checkpoint['chunk_size'] != args.chunk_size:
+			raise ValueError(f"checkpoint {checkpoint_file(args.output)} is for input {checkpoint['input']} with chunk size {checkpoint['chunk_size']}")
+		print(f"RESUMING AFTER {checkpoint['senses']} SENSES AND {checkpoint['examples']} EXAMPLES.")
+	else:
+		checkpoint = {'input': os.path.abspath(args.input), 'chunk_size': args.chunk_size, 'senses': 0, 'examples': 0, 'lemmas_not_found': 0, 'offset': 0}
+		# replaces the checkpoint of an earlier run before the output is rewritten, a resume then starts from the beginning
+		write_checkpoint(args.output, checkpoint)
+
+	with open(args.output, 'r+b' if checkpoint['offset'] else 'wb') as output:
+		output.truncate(checkpoint['offset'])
+		output.seek(checkpoint['offset'])
 		
-		if lemma.replace('_', sp_sym).replace("'", f"'{sp_sym}") in result_spacy or lemma.replace('_', sp_sym).replace("'", f"'{sp_sym}").lower() in result_spacy_lower: example_data['word_rank'] = find_rank(lemma.replace('_', sp_sym).replace("'", f"'{sp_sym}"), result_spacy)
-		else:
-			lemmatized_example = lemmatize_spacy(example, lemma)
-			if lemma.replace('_', sp_sym).replace("'", f"'{sp_sym}") in lemmatized_example: example_data['word_rank'] = find_rank(lemma.replace('_', sp_sym).replace("'", f"'{sp_sym}"), lemmatized_example)
-			else: lemmas_not_found += 1
+		senses = 0
+		for df_senses in dataIO.read_table_chunks(args.input, args.chunk_size, columns=['lemma', 'sense_id'] + dataIO.EXAMPLE_COLUMNS):
+			senses += len(df_senses)
+			if senses <= checkpoint['senses']: continue
 			
-		examples_data.append(example_data)
+			examples_data = find_ranks(melt_examples(df_senses).itertuples(index=False, name=None), models, cache, args.batch_size, args.n_process)
+			if cache is not None: cache.flush()
+			
+			checkpoint['offset'] = append_rows(examples_data, output, header=checkpoint['offset'] == 0)
+			checkpoint['senses'] = senses
+			checkpoint['examples'] += len(examples_data)
+			checkpoint['lemmas_not_found'] += sum(1 for example_data in examples_data if example_data['word_rank'] == -1)
+			write_checkpoint(args.output, checkpoint)
+			print(f"{checkpoint['senses']} senses, {checkpoint['examples']} examples done.")
+	
+	return checkpoint['lemmas_not_found']
+
+
+def validate_sample(input_file, sample_size, nlp):
+	df_examples = data_analysis(input_file)
+	texts = [str(example) for example in df_examples['example']]
+	random.seed(0)
+	texts = random.sample(texts, min(sample_size, len(texts)))
+	return validate_fast_tokenizer(texts, fastTokenizer(nlp.tokenizer), nlp)
+
+
+def process_examples(args, models):
+	cache = exampleCache(args.cache, model_name(models['tokenizer'])) if args.cache else None
+
+	if args.stream:
+		print("FINDING TARGET WORD RANK IN EXAMPLES...")
+		lemmas_not_found = stream_examples(args, models, cache)
+	else:
+		print('WIKTIONARY EXAMPLES EXTRACTION...')	
+		df_examples = data_analysis(args.input)
+		print('WIKTIONARY EXAMPLES EXTRACTED.')
+		print()
+
+		print("FINDING TARGET WORD RANK IN EXAMPLES...")
+		examples_data = find_ranks(df_examples.itertuples(index=False, name=None), models, cache, args.batch_size, args.n_process)
+		lemmas_not_found = sum(1 for example_data in examples_data if example_data['word_rank'] == -1)
+	
+	if cache is not None:
+		cache.flush()
+		print(f"Cache: {cache.hits} examples found, {cache.misses} examples processed with spaCy.")
+
+	if models.get('fast') is not None:
+		print(f"Fast tokenizer: {models['fast'].hits} examples tokenized, {models['fast'].misses} examples tokenized with spaCy.")
 
 	print("FINISHED FINDING TARGET WORD RANK IN EXAMPLES.")
 	print("Number of examples where the target word was not found ", lemmas_not_found)
 
-	examples_data_df = pd.DataFrame(examples_data)
-	examples_data_df.to_csv(args.output, sep='\t', index=False)
+	if not args.stream:
+		examples_data_df = pd.DataFrame(examples_data, columns=OUTPUT_COLUMNS)
+		dataIO.write_table(examples_data_df, args.output)
+
+
+if __name__ == "__main__":
+
+	parser = argparse.ArgumentParser(description="Process wiktionary examples from a TSV file and outputs the resultings processed examples in a TSV file with the tokenized examples and the target word ranks.")
+	parser.add_argument('--input', required=True, help='Path to the input TSV (or parquet) file.')
+	parser.add_argument('--output', required=True, help='Path to the output TSV file (or parquet file if it ends with .parquet).')
+	parser.add_argument('--batch_size', type=int, default=256, help='Number of examples processed at once by spaCy (default: 256).')
+	parser.add_argument('--n_process', type=int, default=1, help='Number of processes used by spaCy to lemmatize the examples where the target word is not found in the tokens (default: 1). The output order does not depend on it.')
+	parser.add_argument('--cache', help='Path to a SQLite file caching the word rank and tokenized example of each example, reused by later runs: only the examples not in the cache go through spaCy.')
+	parser.add_argument('--stream', action='store_true', help='Read the input and append the output (TSV only) chunk by chunk, with a checkpoint after each chunk in OUTPUT.checkpoint. Memory does not depend on the input size.')
+	parser.add_argument('--chunk_size', type=int, default=10000, help='Number of senses read and processed at once with --stream (default: 10000).')
+	parser.add_argument('--resume', action='store_true', help='With --stream, continue from the checkpoint of a previous run with the same input and chunk size.')
+	parser.add_argument('--spacy_tokenizer', action='store_true', help='Tokenize all the examples with spaCy, without the fast tokenizer used for the examples it can tokenize as spaCy.')
+	parser.add_argument('--validate_fast', type=int, metavar='N', help='Only compare the tokens of the fast tokenizer with the tokens of spaCy on N random examples of the input, and print the report.')
+
+	args = parser.parse_args()
+	
+	if args.resume and not args.stream: parser.error('--resume requires --stream')
+	if args.stream and dataIO.is_parquet(args.output): parser.error('--stream writes a TSV output')
+	
+
+	print(f"LOADING SPACY TOKENIZER OF {SPACY_MODEL}...")
+	models = {'tokenizer': spacy.load(SPACY_MODEL, exclude=TOKENIZER_EXCLUDE)}
+	print(f"LOADED SPACY TOKENIZER OF {SPACY_MODEL}.")
+	print()
+	
+	if not args.spacy_tokenizer: models['fast'] = fastTokenizer(models['tokenizer'].tokenizer)
+	
+	if args.validate_fast:
+		print("VALIDATION OF THE FAST TOKENIZER...")
+		validate_sample(args.input, args.validate_fast, models['tokenizer'])
+	else:
+		process_examples(args, models)
@@ -47,6 +47,8 @@ def get_parser_args():
 	parser.add_argument("--ex_data_file", default="./ex_data.tsv", help="The tsv file containing all the annotated examples data from Wiktionary.")
 	parser.add_argument('--out', required=True, help='Path to the output folder where to save the predictions from trained models.')
 	parser.add_argument('--model_dir', required=True, help='Path to the folder where to save the trained models.')
+	parser.add_argument("--encoding_cache", help="Folder where the encoded datasets are saved, and loaded from by the next runs with the same data files and tokenizer.")
+	parser.add_argument("--dynamic_padding", action="store_true", help="Pads each batch to its longest sequence instead of the maximum length, with the shuffled training batches made of sequences of similar lengths.")
 	parser.add_argument('-v', "--trace", action="store_true", help="Toggles the verbose mode. Default=False")
 	args = parser.parse_args()
 	return args
@@ -75,7 +77,8 @@ if __name__ == '__main__':
 	"lr": 0.000005,
 	"weight_decay": 0.001,
 	"frozen": False,
-	"max_seq_length": 100
+	"max_seq_length": 100,
+	"dynamic_padding": args.dynamic_padding
 	}
 	
 	params_ex = {
@@ -86,22 +89,23 @@ if __name__ == '__main__':
 	"lr": 0.000005,
 	"weight_decay": 0.001,
 	"frozen": False,
-	"max_seq_length": 100
+	"max_seq_length": 100,
+	"dynamic_padding": args.dynamic_padding
 	}
 	
 	tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
 	
 	print('ENCODING DEFINITIONS DATA...\n')
 	train_definitions_encoder = data.definitionEncoder(args.sense_data_file, args.ex_data_file, "train", tokenizer, use_sample=False)
-	train_definitions_encoder.encode()
+	train_definitions_encoder.encode(cache_dir=args.encoding_cache)
 	freq_dev_definitions_encoder = data.definitionEncoder(args.sense_data_file, args.ex_data_file, "freq-dev", tokenizer, use_sample=False)
-	freq_dev_definitions_encoder.encode()
+	freq_dev_definitions_encoder.encode(cache_dir=args.encoding_cache)
 	rand_dev_definitions_encoder = data.definitionEncoder(args.sense_data_file, args.ex_data_file, "rand-dev", tokenizer, use_sample=False)
-	rand_dev_definitions_encoder.encode()
+	rand_dev_definitions_encoder.encode(cache_dir=args.encoding_cache)
 	freq_test_definitions_encoder = data.definitionEncoder(args.sense_data_file, args.ex_data_file, "freq-test", tokenizer, use_sample=False)
-	freq_test_definitions_encoder.encode()
+	freq_test_definitions_encoder.encode(cache_dir=args.encoding_cache)
 	rand_test_definitions_encoder = data.definitionEncoder(args.sense_data_file, args.ex_data_file, "rand-test", tokenizer, use_sample=False)
-	rand_test_definitions_encoder.encode()
+	rand_test_definitions_encoder.encode(cache_dir=args.encoding_cache)
 	print('DEFINITIONS DATA ENCODED.\n')
 	
 	print('TRAINING DEFINITION CLASSIFIER...\n')
@@ -155,15 +159,15 @@ if __name__ == '__main__':
 	
 	print('ENCODING EXAMPLES DATA...\n')
 	train_examples_encoder = data.exampleEncoder(args.sense_data_file, args.ex_data_file, "train", tokenizer, use_sample=False, sub_corpus="wiki")
-	train_examples_encoder.encode()
+	train_examples_encoder.encode(cache_dir=args.encoding_cache)
 	freq_dev_examples_encoder = data.exampleEncoder(args.sense_data_file, args.ex_data_file, "freq-dev", tokenizer, use_sample=False, sub_corpus="wiki")
-	freq_dev_examples_encoder.encode()
+	freq_dev_examples_encoder.encode(cache_dir=args.encoding_cache)
 	rand_dev_examples_encoder = data.exampleEncoder(args.sense_data_file, args.ex_data_file, "rand-dev", tokenizer, use_sample=False, sub_corpus="wiki")
-	rand_dev_examples_encoder.encode()
+	rand_dev_examples_encoder.encode(cache_dir=args.encoding_cache)
 	freq_test_examples_encoder = data.exampleEncoder(args.sense_data_file, args.ex_data_file, "freq-test", tokenizer, use_sample=False, sub_corpus="wiki")
-	freq_test_examples_encoder.encode()
+	freq_test_examples_encoder.encode(cache_dir=args.encoding_cache)
 	rand_test_examples_encoder = data.exampleEncoder(args.sense_data_file, args.ex_data_file, "rand-test", tokenizer, use_sample=False, sub_corpus="wiki")
-	rand_test_examples_encoder.encode()
+	rand_test_examples_encoder.encode(cache_dir=args.encoding_cache)
 	print('EXAMPLES DATA ENCODED.\n')
 	
 	print('TRAINING EXAMPLE CLASSIFIER...\n')
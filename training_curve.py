@@ -45,6 +45,8 @@ def get_parser_args():
 	parser.add_argument("--device_id", choices=['cpu', '0', '1', '2', '3'], help="Id of the device used for computation.")
 	parser.add_argument("--sense_data_file", default="./sense_data.tsv", help="The tsv file containing all the annotated sense data from Wiktionary.")
 	parser.add_argument("--ex_data_file", default="./ex_data.tsv", help="The tsv file containing all the annotated examples data from Wiktionary.")
+	parser.add_argument("--encoding_cache", help="Folder where the encoded datasets are saved, and loaded from by the next runs with the same data files and tokenizer.")
+	parser.add_argument("--dynamic_padding", action="store_true", help="Pads each batch to its longest sequence instead of the maximum length, with the shuffled training batches made of sequences of similar lengths.")
 	parser.add_argument('-v', "--trace", action="store_true", help="Toggles the verbose mode. Default=False")
 	args = parser.parse_args()
 	return args
@@ -72,7 +74,8 @@ if __name__ == '__main__':
 		"lr": 0.000005,
 		"weight_decay": 0.001,
 		"frozen": False,
-		"max_seq_length": 100
+		"max_seq_length": 100,
+		"dynamic_padding": args.dynamic_padding
 		}
 	
 	
@@ -84,7 +87,8 @@ if __name__ == '__main__':
 		"lr": 0.000005,
 		"weight_decay": 0.001,
 		"frozen": False,
-		"max_seq_length": 100
+		"max_seq_length": 100,
+		"dynamic_padding": args.dynamic_padding
 		}
 	
 	
@@ -92,21 +96,21 @@ if __name__ == '__main__':
 	"""
 	print('ENCODING DEFINITIONS DATA...\n')
 	train_definitions_encoder = data.definitionEncoder(args.sense_data_file, args.ex_data_file, "train", tokenizer, remove_demonyms=False, use_sample=False)
-	train_definitions_encoder.encode()
+	train_definitions_encoder.encode(cache_dir=args.encoding_cache)
 	train_definitions_encoder.shuffle_data()
 	
 	freq_dev_definitions_encoder = data.definitionEncoder(args.sense_data_file, args.ex_data_file, "freq-dev", tokenizer, remove_demonyms=False, use_sample=False)
-	freq_dev_definitions_encoder.encode()
+	freq_dev_definitions_encoder.encode(cache_dir=args.encoding_cache)
 	
 	rand_dev_definitions_encoder = data.definitionEncoder(args.sense_data_file, args.ex_data_file, "rand-dev", tokenizer, remove_demonyms=False, use_sample=False)
-	rand_dev_definitions_encoder.encode()
+	rand_dev_definitions_encoder.encode(cache_dir=args.encoding_cache)
 	"""
 	"""
 	freq_test_definitions_encoder = data.definitionEncoder(args.sense_data_file, args.ex_data_file, "freq-test", tokenizer, remove_demonyms=False, use_sample=False)
-	freq_test_definitions_encoder.encode()
+	freq_test_definitions_encoder.encode(cache_dir=args.encoding_cache)
 	
 	rand_test_definitions_encoder = data.definitionEncoder(args.sense_data_file, args.ex_data_file, "rand-test", tokenizer, remove_demonyms=False, use_sample=False)
-	rand_test_definitions_encoder.encode()
+	rand_test_definitions_encoder.encode(cache_dir=args.encoding_cache)
 	
 	train_encoder_2000 = train_definitions_encoder.clone()
 	train_encoder_2000.truncate_senses(k=2000)
@@ -194,11 +198,11 @@ if __name__ == '__main__':
 	
 	print('ENCODING EXAMPLES DATA...\n')
 	train_examples_encoder = data.exampleEncoder(args.sense_data_file, args.ex_data_file, "train", tokenizer, use_sample=False, sub_corpus="wiki")
-	train_examples_encoder.encode()
+	train_examples_encoder.encode(cache_dir=args.encoding_cache)
 	freq_dev_examples_encoder = data.exampleEncoder(args.sense_data_file, args.ex_data_file, "freq-dev", tokenizer, use_sample=False, sub_corpus="wiki")
-	freq_dev_examples_encoder.encode()
+	freq_dev_examples_encoder.encode(cache_dir=args.encoding_cache)
 	rand_dev_examples_encoder = data.exampleEncoder(args.sense_data_file, args.ex_data_file, "rand-dev", tokenizer, use_sample=False, sub_corpus="wiki")
-	rand_dev_examples_encoder.encode()
+	rand_dev_examples_encoder.encode(cache_dir=args.encoding_cache)
 	
 	
 	#print(train_examples_encoder.length)